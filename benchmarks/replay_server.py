@@ -0,0 +1,223 @@
+"""Servidor local que imita o Socket.IO (Engine.IO v3) da Blaze Double.
+
+Transmite rodadas gravadas (JSONL de ``blaze_bot/data/backtests``) ou
+sintéticas de 1x a 1000x a velocidade real e pode injetar desconexões,
+frames duplicados e travamentos. Cada rodada sai com ``created_at`` igual ao
+horário de envio, então o ``LatencyProbe`` do bot mede a latência de ponta a
+ponta (socket, parser, fila e Engine).
+
+    python benchmarks/replay_server.py --synthetic 2000 --speed 1000
+    BLAZE_DOUBLE_WS="ws://127.0.0.1:8765/?EIO=3&transport=websocket" \\
+    BLAZE_LATENCY_PROBE=1 TELEGRAM_BOT_TOKEN= python -m blaze_bot.main
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, Set
+
+import websockets
+
+if __package__ is None or __package__ == "":
+    sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from blaze_bot.data.recordings import iter_history
+
+ROLL_INTERVAL = 30.0
+COLOR_CODES = {"white": 0, "red": 1, "black": 2}
+
+
+class ReplayServer:
+    def __init__(
+        self,
+        rolls: Iterable[Dict[str, Any]],
+        *,
+        speed: float = 1.0,
+        ping_interval_ms: int = 25000,
+        ping_timeout_ms: int = 20000,
+        waiting_ticks: int = 3,
+        disconnect_every: int = 0,
+        duplicate_rate: float = 0.0,
+        stall_every: int = 0,
+        stall_seconds: float = 0.0,
+        seed: int | None = None,
+    ) -> None:
+        self.rolls = rolls
+        self.interval = ROLL_INTERVAL / max(speed, 1e-9)
+        self.ping_interval_ms = ping_interval_ms
+        self.ping_timeout_ms = ping_timeout_ms
+        self.waiting_ticks = max(0, waiting_ticks)
+        self.disconnect_every = disconnect_every
+        self.duplicate_rate = duplicate_rate
+        self.stall_every = stall_every
+        self.stall_seconds = stall_seconds
+        self.rng = random.Random(seed)
+        self.subscribers: Set[Any] = set()
+        self.has_subscriber = asyncio.Event()
+        self.stalled = False
+        self.sent = 0
+        self.missed = 0
+        self.duplicates = 0
+        self.disconnects = 0
+        self.stalls = 0
+        self.started_at: float | None = None
+
+    async def handler(self, socket: Any) -> None:
+        handshake = {
+            "sid": uuid.uuid4().hex,
+            "upgrades": [],
+            "pingInterval": self.ping_interval_ms,
+            "pingTimeout": self.ping_timeout_ms,
+        }
+        await socket.send("0" + json.dumps(handshake, separators=(",", ":")))
+        await socket.send("40")
+        try:
+            async for message in socket:
+                if self.stalled:
+                    continue
+                if message == "2":
+                    await socket.send("3")
+                elif message.startswith("42") and '"subscribe"' in message:
+                    self.subscribers.add(socket)
+                    self.has_subscriber.set()
+        except websockets.ConnectionClosed:
+            pass
+        finally:
+            self.subscribers.discard(socket)
+
+    async def stream(self) -> None:
+        await self.has_subscriber.wait()
+        self.started_at = time.monotonic()
+        for roll in self.rolls:
+            for tick in range(self.waiting_ticks):
+                await asyncio.sleep(self.interval / (self.waiting_ticks + 1))
+                await self._broadcast(_tick_frame(roll, "waiting", _now_iso(), with_result=False))
+            await asyncio.sleep(self.interval / (self.waiting_ticks + 1))
+            frame = _tick_frame(roll, "complete", _now_iso(), with_result=True)
+            if not self.subscribers:
+                self.missed += 1
+            await self._broadcast(frame)
+            self.sent += 1
+            if self.duplicate_rate and self.rng.random() < self.duplicate_rate:
+                await self._broadcast(frame)
+                self.duplicates += 1
+            if self.disconnect_every and self.sent % self.disconnect_every == 0:
+                await self._disconnect_all()
+            if self.stall_every and self.sent % self.stall_every == 0:
+                await self._stall()
+
+    def report(self) -> None:
+        elapsed = time.monotonic() - self.started_at if self.started_at is not None else 0.0
+        rate = self.sent / elapsed if elapsed > 0 else 0.0
+        print(
+            f"[SERVIDOR] Rodadas: {self.sent} | Tempo: {elapsed:.1f}s | "
+            f"Throughput: {rate:.1f} rodadas/s | Sem inscritos: {self.missed} | "
+            f"Duplicadas: {self.duplicates} | Desconexões: {self.disconnects} | "
+            f"Travamentos: {self.stalls}"
+        )
+
+    async def _broadcast(self, frame: str) -> None:
+        for socket in list(self.subscribers):
+            try:
+                await socket.send(frame)
+            except websockets.ConnectionClosed:
+                self.subscribers.discard(socket)
+
+    async def _disconnect_all(self) -> None:
+        self.disconnects += 1
+        for socket in list(self.subscribers):
+            await socket.close()
+        self.subscribers.clear()
+
+    async def _stall(self) -> None:
+        """Para de enviar frames e de responder pings, sem fechar a conexão."""
+        self.stalls += 1
+        self.stalled = True
+        await asyncio.sleep(self.stall_seconds)
+        self.stalled = False
+
+
+def synthetic_rolls(count: int, *, seed: int | None = None) -> Iterator[Dict[str, Any]]:
+    rng = random.Random(seed)
+    for _ in range(count):
+        number = rng.randint(0, 14)
+        color = "white" if number == 0 else ("red" if number <= 7 else "black")
+        yield {"number": number, "color": color}
+
+
+def _tick_frame(roll: Dict[str, Any], status: str, created_at: str, *, with_result: bool) -> str:
+    payload = {
+        "id": uuid.uuid4().hex,
+        "color": COLOR_CODES.get(roll.get("color"), roll.get("color")) if with_result else None,
+        "roll": roll.get("number") if with_result else None,
+        "created_at": created_at,
+        "updated_at": created_at,
+        "status": status,
+    }
+    return "42" + json.dumps(
+        ["data", {"id": "double.tick", "payload": payload}], separators=(",", ":")
+    )
+
+
+def _now_iso() -> str:
+    now = datetime.now(timezone.utc)
+    return now.isoformat(timespec="milliseconds").replace("+00:00", "Z")
+
+
+async def serve(args: argparse.Namespace) -> None:
+    if args.history:
+        rolls: Iterable[Dict[str, Any]] = iter_history(args.history)
+    else:
+        rolls = synthetic_rolls(args.synthetic, seed=args.seed)
+    server = ReplayServer(
+        rolls,
+        speed=args.speed,
+        ping_interval_ms=args.ping_interval,
+        ping_timeout_ms=args.ping_timeout,
+        waiting_ticks=args.waiting_ticks,
+        disconnect_every=args.disconnect_every,
+        duplicate_rate=args.duplicate_rate,
+        stall_every=args.stall_every,
+        stall_seconds=args.stall_seconds,
+        seed=args.seed,
+    )
+    async with websockets.serve(server.handler, args.host, args.port):
+        print(f"[SERVIDOR] Ouvindo em ws://{args.host}:{args.port}/?EIO=3&transport=websocket")
+        try:
+            await server.stream()
+        finally:
+            server.report()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Servidor local de replay da Blaze Double")
+    parser.add_argument("--history", type=Path, help="JSONL (opcionalmente .gz/.xz) com rodadas")
+    parser.add_argument("--synthetic", type=int, default=1000, help="Rodadas sintéticas sem --history")
+    parser.add_argument("--speed", type=float, default=1.0, help="1 = uma rodada a cada 30s")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--ping-interval", type=int, default=25000, help="Em milissegundos")
+    parser.add_argument("--ping-timeout", type=int, default=20000, help="Em milissegundos")
+    parser.add_argument("--waiting-ticks", type=int, default=3, help="Frames waiting por rodada")
+    parser.add_argument("--disconnect-every", type=int, default=0, help="Derruba os clientes a cada N rodadas")
+    parser.add_argument("--duplicate-rate", type=float, default=0.0, help="Chance de repetir o frame da rodada")
+    parser.add_argument("--stall-every", type=int, default=0, help="Trava o servidor a cada N rodadas")
+    parser.add_argument("--stall-seconds", type=float, default=0.0, help="Duração de cada travamento")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
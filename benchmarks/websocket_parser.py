@@ -0,0 +1,192 @@
+"""Microbenchmark do parser de frames Socket.IO do Double.
+
+Compara ``BlazeDoubleWebSocket._parse_message`` com a implementação anterior
+(reproduzida abaixo) sobre uma captura (``BLAZE_DOUBLE_CAPTURE``, ou um frame
+por linha) ou, sem arquivo,
+sobre uma sequência sintética parecida com a do servidor: muitos ticks
+``waiting`` com apostas, alguns ``rolling``/``complete`` e pings.
+
+    python benchmarks/websocket_parser.py [frames.txt] [--repeat 5]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+if __package__ is None or __package__ == "":
+    sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from blaze_bot.data.capture import iter_frames
+from blaze_bot.data.websocket_double import BlazeDoubleWebSocket
+
+
+class LegacyParser:
+    """Parser anterior ao fast-path, mantido só para comparação."""
+
+    def __init__(self) -> None:
+        self._last_status: str | None = None
+        self._last_result_signature: tuple[Any, ...] | None = None
+
+    def parse(self, message: str) -> Dict[str, Any] | None:
+        if message.startswith("42"):
+            message = message[2:]
+            if message.startswith("/"):
+                _, _, payload = message.partition(",")
+                message = payload
+        elif message in {"2", "3"}:
+            return None
+        elif message:
+            return None
+        try:
+            payload = json.loads(message)
+        except json.JSONDecodeError:
+            return None
+
+        data: Any
+        if isinstance(payload, list) and len(payload) >= 2 and payload[0] == "data":
+            data = payload[1]
+        else:
+            data = payload.get("data") if isinstance(payload, dict) else None
+
+        if isinstance(data, dict) and isinstance(data.get("payload"), dict):
+            data = data["payload"]
+
+        status = data.get("status") if isinstance(data, dict) else None
+        if isinstance(status, str) and status != self._last_status:
+            self._last_status = status
+        if status == "waiting":
+            self._last_status = "waiting"
+            return None
+
+        if isinstance(data, dict):
+            color = data.get("color") if "color" in data else data.get("colour")
+            number = data.get("roll") if "roll" in data else data.get("number")
+            timestamp = data.get("created_at") or data.get("timestamp")
+        else:
+            if isinstance(payload, dict):
+                color = payload.get("color") if "color" in payload else payload.get("colour")
+                number = payload.get("roll") if "roll" in payload else payload.get("number")
+                timestamp = payload.get("created_at") or payload.get("timestamp")
+            else:
+                color = None
+                number = None
+                timestamp = None
+
+        if color is None or number is None:
+            return None
+
+        if timestamp is None:
+            timestamp = datetime.utcnow().isoformat()
+
+        normalized_color = self._normalize_color(color)
+        signature = (int(number), normalized_color, timestamp)
+        if self._last_result_signature == signature:
+            return None
+        self._last_result_signature = signature
+
+        return {"timestamp": timestamp, "number": int(number), "color": normalized_color}
+
+    def _normalize_color(self, color: Any) -> str:
+        if isinstance(color, str):
+            return color
+        mapping = {0: "white", 1: "red", 2: "black"}
+        return mapping.get(int(color), str(color))
+
+
+def synthetic_frames(rolls: int = 200, seed: int = 7) -> List[str]:
+    rng = random.Random(seed)
+    frames: List[str] = []
+    for index in range(rolls):
+        created_at = f"2026-01-01T00:{index // 60 % 60:02d}:{index % 60:02d}.000Z"
+        bets: List[Dict[str, Any]] = []
+        for tick in range(25):
+            bets.append(
+                {
+                    "id": rng.getrandbits(32),
+                    "color": rng.choice([0, 1, 2]),
+                    "amount": round(rng.uniform(1, 500), 2),
+                    "currency_type": "BRL",
+                    "status": "created",
+                    "user": {"id": rng.getrandbits(24), "username": f"user{rng.getrandbits(16)}"},
+                }
+            )
+            frames.append(_tick(index, created_at, "waiting", None, None, bets))
+            if tick % 10 == 0:
+                frames.append("2")
+        number = rng.randint(0, 14)
+        color = 0 if number == 0 else (1 if number <= 7 else 2)
+        frames.append(_tick(index, created_at, "rolling", color, number, bets))
+        frames.append(_tick(index, created_at, "complete", color, number, bets))
+    return frames
+
+
+def _tick(
+    index: int,
+    created_at: str,
+    status: str,
+    color: int | None,
+    number: int | None,
+    bets: List[Dict[str, Any]],
+) -> str:
+    payload = {
+        "id": f"roll-{index}",
+        "color": color,
+        "roll": number,
+        "created_at": created_at,
+        "updated_at": created_at,
+        "status": status,
+        "total_red_eur_bet": 123.45,
+        "total_black_eur_bet": 234.56,
+        "total_white_eur_bet": 12.3,
+        "bets": bets,
+    }
+    return "42" + json.dumps(
+        ["data", {"id": "double.tick", "payload": payload}], separators=(",", ":")
+    )
+
+
+def measure(
+    factory: Callable[[], Callable[[str], Any]], frames: List[str], repeat: int
+) -> tuple[float, int]:
+    """Melhor throughput entre ``repeat`` passadas, com um parser novo em cada."""
+    best = float("inf")
+    results = 0
+    for _ in range(repeat):
+        parse = factory()
+        started = time.perf_counter()
+        results = sum(1 for frame in frames if parse(frame))
+        best = min(best, time.perf_counter() - started)
+    return len(frames) / best, results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark do parser de frames do Double")
+    parser.add_argument("frames", nargs="?", type=Path, help="Captura de frames (.log/.gz/.xz)")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    if args.frames:
+        frames = [frame for _, frame in iter_frames(args.frames)]
+    else:
+        frames = synthetic_frames()
+
+    legacy_fps, legacy_results = measure(lambda: LegacyParser().parse, frames, args.repeat)
+    current_fps, current_results = measure(
+        lambda: BlazeDoubleWebSocket("ws://benchmark")._parse_message, frames, args.repeat
+    )
+
+    print(f"Frames: {len(frames)}")
+    print(f"Anterior: {legacy_fps:,.0f} frames/s ({legacy_results} resultados)")
+    print(f"Atual:    {current_fps:,.0f} frames/s ({current_results} resultados)")
+    print(f"Ganho:    {current_fps / legacy_fps:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,9 @@ from __future__ import annotations
 
 import os
 from dataclasses import dataclass
+from pathlib import Path
+
+from blaze_bot.core.history import DEFAULT_RETENTION
 
 
 @dataclass(frozen=True)
@@ -12,8 +15,24 @@ class Settings:
     websocket_result_timeout: float
     websocket_reconnect_backoff_initial: float
     websocket_reconnect_backoff_max: float
+    websocket_queue_size: int
+    websocket_queue_overflow: str
+    websocket_connections: int
+    websocket_capture_path: Path | None
+    history_retention: int | None
+    latency_probe: bool
+    recording_commit_every: int
+    recording_commit_interval: float
+    recording_fsync: bool
+    recording_rotate_bytes: int
+    recording_rotate_seconds: float
+    recording_compression: str
+    checkpoint_every: int
+    checkpoint_max_age: float
     telegram_token: str | None
     telegram_chat_id: str | None
+    telegram_digest_window: float | None
+    telegram_outbox: bool
 
     @classmethod
     def from_env(cls) -> "Settings":
@@ -31,6 +50,40 @@ class Settings:
             websocket_reconnect_backoff_max=float(
                 os.getenv("BLAZE_DOUBLE_RECONNECT_BACKOFF_MAX", "10")
             ),
+            websocket_queue_size=int(os.getenv("BLAZE_DOUBLE_QUEUE_SIZE", "100")),
+            websocket_queue_overflow=os.getenv("BLAZE_DOUBLE_QUEUE_OVERFLOW", "drop_oldest"),
+            websocket_connections=max(1, int(os.getenv("BLAZE_DOUBLE_CONNECTIONS", "1"))),
+            websocket_capture_path=_optional_path(os.getenv("BLAZE_DOUBLE_CAPTURE")),
+            history_retention=_optional_int(
+                os.getenv("BLAZE_HISTORY_RETENTION", str(DEFAULT_RETENTION))
+            ),
+            latency_probe=os.getenv("BLAZE_LATENCY_PROBE", "0") == "1",
+            recording_commit_every=max(1, int(os.getenv("BLAZE_RECORDING_COMMIT_EVERY", "10"))),
+            recording_commit_interval=float(os.getenv("BLAZE_RECORDING_COMMIT_INTERVAL", "1")),
+            recording_fsync=os.getenv("BLAZE_RECORDING_FSYNC", "1") != "0",
+            recording_rotate_bytes=int(
+                float(os.getenv("BLAZE_RECORDING_ROTATE_MB", "32")) * 1024 * 1024
+            ),
+            recording_rotate_seconds=float(os.getenv("BLAZE_RECORDING_ROTATE_HOURS", "24")) * 3600,
+            recording_compression=os.getenv("BLAZE_RECORDING_COMPRESSION", "xz"),
+            checkpoint_every=int(os.getenv("BLAZE_CHECKPOINT_EVERY", "1")),
+            checkpoint_max_age=float(os.getenv("BLAZE_CHECKPOINT_MAX_AGE", "900")),
             telegram_token=os.getenv("TELEGRAM_BOT_TOKEN", "8214223602:AAG9Ut7QVpTX8aZkS316PcELX94Ci5WaYFM"),
             telegram_chat_id=os.getenv("TELEGRAM_CHAT_ID", "-5138181857"),
+            telegram_digest_window=_optional_float(os.getenv("TELEGRAM_DIGEST_WINDOW", "0")),
+            telegram_outbox=os.getenv("TELEGRAM_OUTBOX", "1") != "0",
         )
+
+
+def _optional_int(raw: str) -> int | None:
+    value = int(raw)
+    return value if value > 0 else None
+
+
+def _optional_float(raw: str) -> float | None:
+    value = float(raw)
+    return value if value >= 0 else None
+
+
+def _optional_path(raw: str | None) -> Path | None:
+    return Path(raw) if raw else None
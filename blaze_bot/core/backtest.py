@@ -2,18 +2,35 @@ from __future__ import annotations
 
 from typing import Any, Dict, Iterable, List, Sequence
 
+from blaze_bot.core.history import RollHistory
 from blaze_bot.core.stats import Stats
-from blaze_bot.strategies.base import MultiStrategy, StrategyBase
+from blaze_bot.strategies.base import StrategyBase
 
 
-def run_backtest(strategy: StrategyBase, history: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+def run_backtest(
+    strategy: StrategyBase,
+    history: Iterable[Dict[str, Any]],
+    *,
+    history_limit: int | None = None,
+) -> Dict[str, Any]:
+    """Backtest com uma lane independente por estratégia.
+
+    Cada estratégia de um MultiStrategy tem suas próprias predições pendentes
+    (incluindo martingale), então o resultado por estratégia é o mesmo de
+    rodá-la isoladamente.
+    """
     stats = Stats()
     strategy_stats: Dict[str, Stats] = {}
     predictions: List[tuple[StrategyBase, Dict[str, Any], int, bool]] = []
-    buffered_history: List[Dict[str, Any]] = []
+    buffered_history = RollHistory(maxlen=history_limit)
+    lanes = strategy.lanes()
+    keep_history = not strategy.is_incremental()
+    rolls = 0
 
     for result in history:
-        buffered_history.append(result)
+        rolls += 1
+        if keep_history:
+            buffered_history.append(result)
         if predictions:
             pending: List[tuple[StrategyBase, Dict[str, Any], int, bool]] = []
             for prediction_strategy, prediction, remaining_martingale, counted in predictions:
@@ -59,30 +76,20 @@ def run_backtest(strategy: StrategyBase, history: Iterable[Dict[str, Any]]) -> D
                         (prediction_strategy, prediction, remaining_martingale - 1, counted)
                     )
             predictions = pending
-            if predictions:
+        strategy.on_result(result)
+        busy = {id(item[0]) for item in predictions}
+        for lane_strategy in lanes:
+            if id(lane_strategy) in busy:
                 continue
-        strategy.analyze(buffered_history)
-        if isinstance(strategy, MultiStrategy):
-            predictions = [
-                (
-                    item_strategy,
-                    item_prediction,
-                    item_strategy.martingale_limit(),
-                    False,
-                )
-                for item_strategy, item_prediction in strategy.predictions_with_strategies(
-                    buffered_history
+            predictions.extend(
+                (lane_strategy, item, lane_strategy.martingale_limit(), False)
+                for item in _normalize_predictions(
+                    lane_strategy.next_prediction(buffered_history)
                 )
-            ]
-        else:
-            prediction = strategy.predict(buffered_history)
-            normalized = _normalize_predictions(prediction)
-            predictions = [
-                (strategy, item, strategy.martingale_limit(), False)
-                for item in normalized
-            ]
+            )
 
     return {
+        "rolls": rolls,
         "entries": stats.total_entries,
         "wins": stats.wins,
         "losses": stats.losses,
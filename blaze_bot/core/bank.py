@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Dict, Iterable
+from typing import Any, Dict, Iterable
 
 
 @dataclass(frozen=True)
@@ -81,6 +81,23 @@ class BankManager:
             }
         return snapshot
 
+    def export_state(self) -> Dict[str, Any]:
+        return {
+            "settings": self.settings,
+            "banks": dict(self.banks),
+            "martingale_banks": dict(self.martingale_banks),
+            "martingale_enabled": dict(self.martingale_enabled),
+        }
+
+    def restore_state(self, state: Dict[str, Any]) -> bool:
+        """Retoma as bancas salvas se as configurações forem as mesmas."""
+        if state.get("settings") != self.settings:
+            return False
+        self.banks = dict(state["banks"])
+        self.martingale_banks = dict(state["martingale_banks"])
+        self.martingale_enabled = dict(state["martingale_enabled"])
+        return True
+
     def _bet_amount(self, current_bank: float) -> float:
         if self.settings.mode == "multiplicative":
             return current_bank * self.settings.bet_value
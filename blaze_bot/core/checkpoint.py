@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+import logging
+import os
+import pickle
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict
+
+from blaze_bot.core.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINT_VERSION = 1
+
+
+@dataclass
+class CheckpointMetrics:
+    saves: int = 0
+    written: int = 0
+    superseded: int = 0
+    failed: int = 0
+    last_size: int = 0
+    max_serialize_ms: float = 0.0
+
+
+class Checkpointer:
+    """Snapshots periódicos do ``Engine`` em disco para retomar após reinício.
+
+    ``save`` serializa o estado (histórico, estratégias com suas features,
+    estatísticas, bancas e predições pendentes, inclusive o passo do
+    martingale) com ``pickle`` na thread que chamou, para capturar uma
+    versão consistente entre duas rodadas. A escrita fica com uma thread
+    própria: só o snapshot mais recente é gravado, em um temporário com
+    ``fsync`` seguido de ``os.replace``, então um crash nunca deixa um
+    arquivo pela metade.
+
+    O arquivo é um pickle e só deve ser lido de um diretório confiável.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        *,
+        every: int = 1,
+        max_age: float = 900.0,
+        fsync: bool = True,
+    ) -> None:
+        self.path = path
+        self.every = max(1, every)
+        self.max_age = max_age
+        self.fsync = fsync
+        self.metrics = CheckpointMetrics()
+        self._rolls = 0
+        self._latest: bytes | None = None
+        self._closing = False
+        self._condition = threading.Condition()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._worker = threading.Thread(target=self._run, name="checkpoint", daemon=True)
+        self._worker.start()
+
+    def restore(self, engine: Engine) -> str | None:
+        """Carrega o último snapshot no ``engine``; devolve um resumo ou ``None``.
+
+        Snapshots de outra combinação de estratégias, de outra versão ou
+        ilegíveis são ignorados. Com mais de ``max_age`` segundos as rodadas
+        perdidas no intervalo invalidam histórico, estado das estratégias e
+        predições pendentes, e só estatísticas e bancas são retomadas.
+        """
+        if not self.path.exists():
+            return None
+        try:
+            with self.path.open("rb") as handle:
+                payload = pickle.load(handle)
+        except Exception as exc:  # noqa: BLE001 - snapshot corrompido ou de outra versão
+            logger.warning("Checkpoint %s ignorado: %s", self.path, exc)
+            return None
+        if not isinstance(payload, dict) or payload.get("version") != CHECKPOINT_VERSION:
+            logger.warning("Checkpoint %s ignorado: versão incompatível.", self.path)
+            return None
+        state: Dict[str, Any] = payload["state"]
+        expected = [lane.strategy_name() for lane in engine.strategy.lanes()]
+        if state.get("strategies") != expected:
+            logger.warning(
+                "Checkpoint %s ignorado: estratégias %s diferentes de %s.",
+                self.path,
+                state.get("strategies"),
+                expected,
+            )
+            return None
+        age = time.time() - float(payload.get("saved_at", 0.0))
+        stale = age > self.max_age
+        engine.restore_state(state, accounting_only=stale)
+        if stale:
+            return (
+                f"estatísticas e bancas de {age / 60:.0f} min atrás "
+                "(estado das estratégias descartado)"
+            )
+        martingale = [
+            f"{state_item.strategy_name} gale {state_item.martingale_step}"
+            for state_item in engine.last_predictions
+            if state_item.martingale_step
+        ]
+        summary = (
+            f"{engine.history.total} rodadas, "
+            f"{len(engine.last_predictions)} predição(ões) pendente(s)"
+        )
+        if martingale:
+            summary += f" ({', '.join(martingale)})"
+        return f"{summary}, salvo há {age:.0f}s"
+
+    def maybe_save(self, engine: Engine) -> None:
+        self._rolls += 1
+        if self._rolls % self.every == 0:
+            self.save(engine)
+
+    def save(self, engine: Engine) -> None:
+        started = time.perf_counter()
+        try:
+            payload = {
+                "version": CHECKPOINT_VERSION,
+                "saved_at": time.time(),
+                "state": engine.export_state(),
+            }
+            blob = pickle.dumps(payload, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception:  # noqa: BLE001 - o checkpoint não pode derrubar o engine
+            self.metrics.failed += 1
+            logger.exception("Falha ao serializar o checkpoint.")
+            return
+        self.metrics.max_serialize_ms = max(
+            self.metrics.max_serialize_ms, (time.perf_counter() - started) * 1000
+        )
+        with self._condition:
+            if self._latest is not None:
+                self.metrics.superseded += 1
+            self._latest = blob
+            self.metrics.saves += 1
+            self._condition.notify()
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "saves": self.metrics.saves,
+            "written": self.metrics.written,
+            "superseded": self.metrics.superseded,
+            "failed": self.metrics.failed,
+            "last_size": self.metrics.last_size,
+            "max_serialize_ms": self.metrics.max_serialize_ms,
+        }
+
+    def close(self, timeout: float | None = 10.0) -> None:
+        """Grava o snapshot pendente (se houver) e encerra a thread."""
+        with self._condition:
+            self._closing = True
+            self._condition.notify()
+        self._worker.join(timeout)
+
+    def _next_blob(self) -> bytes | None:
+        with self._condition:
+            while self._latest is None and not self._closing:
+                self._condition.wait()
+            blob, self._latest = self._latest, None
+            return blob
+
+    def _run(self) -> None:
+        while True:
+            blob = self._next_blob()
+            if blob is None:
+                return
+            try:
+                self._write(blob)
+            except Exception:  # noqa: BLE001 - a thread não pode morrer
+                self.metrics.failed += 1
+                logger.exception("Falha ao gravar o checkpoint em %s.", self.path)
+
+    def _write(self, blob: bytes) -> None:
+        temporary = self.path.with_name(f"{self.path.name}.tmp")
+        with temporary.open("wb") as handle:
+            handle.write(blob)
+            handle.flush()
+            if self.fsync:
+                os.fsync(handle.fileno())
+        os.replace(temporary, self.path)
+        self.metrics.written += 1
+        self.metrics.last_size = len(blob)
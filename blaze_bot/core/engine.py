@@ -4,8 +4,9 @@ from dataclasses import dataclass
 from typing import Any, Dict, Iterable, List, Optional, Sequence
 
 from blaze_bot.core.bank import BankManager
+from blaze_bot.core.history import DEFAULT_RETENTION, RollHistory
 from blaze_bot.core.stats import Stats
-from blaze_bot.strategies.base import MultiStrategy, StrategyBase
+from blaze_bot.strategies.base import StrategyBase
 
 
 @dataclass
@@ -24,10 +25,11 @@ class Engine:
         strategy: StrategyBase,
         notifiers: Iterable[Any],
         bank_manager: BankManager | None = None,
+        history_limit: int | None = DEFAULT_RETENTION,
     ) -> None:
         self.strategy = strategy
         self.notifiers = list(notifiers)
-        self.history: List[Dict[str, Any]] = []
+        self.history = RollHistory(maxlen=history_limit)
         self.stats = Stats()
         self.strategy_stats: Dict[str, Stats] = {}
         self.last_predictions: List[PredictionState] = []
@@ -166,23 +168,24 @@ class Engine:
                             },
                         )
             self.last_predictions = pending_predictions
-            if pending_predictions:
-                for prediction_state in pending_predictions:
-                    prediction_payload = {
-                        **prediction_state.prediction,
-                        "strategy": prediction_state.strategy_name,
-                    }
-                    for notifier in self.notifiers:
-                        if hasattr(notifier, "prediction"):
-                            notifier.prediction(prediction_payload)
-                return
-
-        self.strategy.analyze(self.history)
-        if isinstance(self.strategy, MultiStrategy):
-            predictions = self.strategy.predictions_with_strategies(self.history)
-            if not predictions:
-                return
-            for strategy, prediction_item in predictions:
+
+        self.strategy.on_result(result)
+        for prediction_state in self.last_predictions:
+            prediction_payload = {
+                **prediction_state.prediction,
+                "strategy": prediction_state.strategy_name,
+            }
+            for notifier in self.notifiers:
+                if hasattr(notifier, "prediction"):
+                    notifier.prediction(prediction_payload)
+
+        busy = {id(prediction_state.strategy) for prediction_state in self.last_predictions}
+        for strategy in self.strategy.lanes():
+            if id(strategy) in busy:
+                continue
+            for prediction_item in self._normalize_predictions(
+                strategy.next_prediction(self.history)
+            ):
                 strategy_name = strategy.strategy_name()
                 prediction_state = PredictionState(
                     prediction=prediction_item,
@@ -195,25 +198,70 @@ class Engine:
                 for notifier in self.notifiers:
                     if hasattr(notifier, "prediction"):
                         notifier.prediction(prediction_payload)
-            return
 
-        prediction = self.strategy.predict(self.history)
-        normalized_predictions = self._normalize_predictions(prediction)
-        if not normalized_predictions:
+        for notifier in self.notifiers:
+            if hasattr(notifier, "roll_complete"):
+                notifier.roll_complete()
+
+    def export_state(self) -> Dict[str, Any]:
+        """Estado necessário para retomar a sessão (ver ``core.checkpoint``).
+
+        As predições pendentes guardam o índice da lane em vez da estratégia,
+        que é serializada uma única vez junto com suas features.
+        """
+        lanes = self.strategy.lanes()
+        lane_index = {id(lane): index for index, lane in enumerate(lanes)}
+        return {
+            "strategies": [lane.strategy_name() for lane in lanes],
+            "history": self.history,
+            "stats": self.stats,
+            "strategy_stats": self.strategy_stats,
+            "strategy": self.strategy,
+            "predictions": [
+                {
+                    "lane": lane_index[id(state.strategy)],
+                    "prediction": state.prediction,
+                    "strategy_name": state.strategy_name,
+                    "remaining_martingale": state.remaining_martingale,
+                    "martingale_step": state.martingale_step,
+                    "counted": state.counted,
+                }
+                for state in self.last_predictions
+            ],
+            "bank": self.bank_manager.export_state() if self.bank_manager is not None else None,
+        }
+
+    def restore_state(self, state: Dict[str, Any], *, accounting_only: bool = False) -> None:
+        """Retoma o estado exportado por ``export_state``.
+
+        Com ``accounting_only`` só estatísticas e banca são restauradas;
+        histórico, estratégias e predições pendentes começam do zero.
+        """
+        self.stats = state["stats"]
+        self.strategy_stats = state["strategy_stats"]
+        if self.bank_manager is not None and state.get("bank") is not None:
+            self.bank_manager.restore_state(state["bank"])
+        if accounting_only:
             return
-        for prediction_item in normalized_predictions:
-            strategy_name = self.strategy.strategy_name()
-            prediction_state = PredictionState(
-                prediction=prediction_item,
-                strategy_name=strategy_name,
-                strategy=self.strategy,
-                remaining_martingale=self.strategy.martingale_limit(),
+        history: RollHistory = state["history"]
+        if history.maxlen == self.history.maxlen:
+            self.history = history
+        else:
+            self.history.extend(history)
+            self.history.total = history.total
+        self.strategy = state["strategy"]
+        lanes = self.strategy.lanes()
+        self.last_predictions = [
+            PredictionState(
+                prediction=item["prediction"],
+                strategy_name=item["strategy_name"],
+                strategy=lanes[item["lane"]],
+                remaining_martingale=item["remaining_martingale"],
+                martingale_step=item["martingale_step"],
+                counted=item["counted"],
             )
-            self.last_predictions.append(prediction_state)
-            prediction_payload = {**prediction_item, "strategy": strategy_name}
-            for notifier in self.notifiers:
-                if hasattr(notifier, "prediction"):
-                    notifier.prediction(prediction_payload)
+            for item in state["predictions"]
+        ]
 
     def snapshot_stats(self) -> Dict[str, Any]:
         return {
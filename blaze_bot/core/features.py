@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+from typing import Any, Dict, Hashable, Mapping
+
+
+class FeatureStore:
+    """Calcula cada feature registrada uma única vez por resultado.
+
+    Features são objetos com ``key``, ``push(color)`` e ``reset()`` (ver
+    ``blaze_bot.core.rolling``). Registrar uma feature com a mesma ``key`` de
+    outra já existente devolve a instância compartilhada.
+    """
+
+    def __init__(self) -> None:
+        self._features: Dict[Hashable, Any] = {}
+        self.rolls = 0
+
+    def __len__(self) -> int:
+        return len(self._features)
+
+    def register(self, feature: Any) -> Any:
+        existing = self._features.get(feature.key)
+        if existing is not None:
+            return existing
+        if self.rolls:
+            raise ValueError(
+                f"Feature {feature.key!r} registrada após {self.rolls} resultados."
+            )
+        self._features[feature.key] = feature
+        return feature
+
+    def register_all(self, features: Mapping[str, Any]) -> Dict[str, Any]:
+        return {name: self.register(feature) for name, feature in features.items()}
+
+    def push(self, result: Dict[str, Any]) -> None:
+        color = result.get("color")
+        for feature in self._features.values():
+            feature.push(color)
+        self.rolls += 1
+
+    def reset(self) -> None:
+        for feature in self._features.values():
+            feature.reset()
+        self.rolls = 0
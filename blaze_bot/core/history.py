@@ -0,0 +1,201 @@
+from __future__ import annotations
+
+from array import array
+from collections.abc import Sequence
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, Iterator, List, overload
+
+DEFAULT_RETENTION = 5000
+
+COLOR_CODES = {"white": 0, "red": 1, "black": 2}
+COLOR_NAMES = {code: name for name, code in COLOR_CODES.items()}
+UNKNOWN_COLOR = -1
+UNKNOWN_NUMBER = -1
+UNKNOWN_TIMESTAMP = -1
+
+
+class RollHistory(Sequence):
+    """Histórico colunar de rodadas (cor/número int8, timestamp int64 em ms).
+
+    Com ``maxlen`` definido funciona como buffer circular: o append é O(1) e a
+    memória fica constante, mantendo apenas as últimas ``maxlen`` rodadas.
+    A leitura é compatível com a lista de dicts usada antes (``history[-20:]``,
+    ``item.get("color")``); cada item é reconstruído sob demanda.
+    """
+
+    def __init__(
+        self,
+        results: Iterable[Dict[str, Any]] = (),
+        *,
+        maxlen: int | None = None,
+    ) -> None:
+        if maxlen is not None and maxlen <= 0:
+            raise ValueError("maxlen deve ser positivo.")
+        self.maxlen = maxlen
+        self._colors = array("b")
+        self._numbers = array("b")
+        self._timestamps = array("q")
+        self._start = 0
+        self._size = 0
+        self.total = 0
+        if maxlen is not None:
+            self._colors = array("b", bytes(maxlen))
+            self._numbers = array("b", bytes(maxlen))
+            self._timestamps = array("q", bytes(8 * maxlen))
+        for result in results:
+            self.append(result)
+
+    @classmethod
+    def from_columns(
+        cls,
+        colors: array,
+        numbers: array,
+        timestamps: array,
+        *,
+        total: int | None = None,
+        maxlen: int | None = None,
+    ) -> "RollHistory":
+        """Monta o histórico direto das colunas, sem passar por dicts.
+
+        As colunas são usadas como estão (sem cópia) e devem ter o mesmo
+        tamanho; com ``maxlen`` ficam só as últimas ``maxlen`` rodadas.
+        """
+        if not len(colors) == len(numbers) == len(timestamps):
+            raise ValueError("As colunas devem ter o mesmo tamanho.")
+        if maxlen is not None and len(colors) > maxlen:
+            colors, numbers, timestamps = colors[-maxlen:], numbers[-maxlen:], timestamps[-maxlen:]
+        history = cls(maxlen=maxlen)
+        size = len(colors)
+        if maxlen is not None and size < maxlen:
+            history._colors[:size] = colors
+            history._numbers[:size] = numbers
+            history._timestamps[:size] = timestamps
+        else:
+            history._colors = colors
+            history._numbers = numbers
+            history._timestamps = timestamps
+        history._size = size
+        history.total = size if total is None else total
+        return history
+
+    def __len__(self) -> int:
+        return self._size
+
+    @overload
+    def __getitem__(self, index: int) -> Dict[str, Any]: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[Dict[str, Any]]: ...
+
+    def __getitem__(self, index: int | slice) -> Dict[str, Any] | List[Dict[str, Any]]:
+        if isinstance(index, slice):
+            return [self._row(position) for position in range(self._size)[index]]
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError("RollHistory index out of range")
+        return self._row(index)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for position in range(self._size):
+            yield self._row(position)
+
+    def append(self, result: Dict[str, Any]) -> None:
+        color = COLOR_CODES.get(result.get("color"), UNKNOWN_COLOR)
+        number = _to_number(result.get("number"))
+        timestamp = to_epoch_ms(result.get("timestamp"))
+        self.total += 1
+        if self.maxlen is None:
+            self._colors.append(color)
+            self._numbers.append(number)
+            self._timestamps.append(timestamp)
+            self._size += 1
+            return
+        slot = (self._start + self._size) % self.maxlen
+        self._colors[slot] = color
+        self._numbers[slot] = number
+        self._timestamps[slot] = timestamp
+        if self._size < self.maxlen:
+            self._size += 1
+        else:
+            self._start = (self._start + 1) % self.maxlen
+
+    def extend(self, results: Iterable[Dict[str, Any]]) -> None:
+        for result in results:
+            self.append(result)
+
+    def clear(self) -> None:
+        self._start = 0
+        self._size = 0
+        self.total = 0
+        if self.maxlen is None:
+            self._colors = array("b")
+            self._numbers = array("b")
+            self._timestamps = array("q")
+
+    def color_codes(self) -> array:
+        """Cópia das cores em ordem cronológica (0=branco, 1=vermelho, 2=preto)."""
+        return self._ordered(self._colors)
+
+    def numbers(self) -> array:
+        return self._ordered(self._numbers)
+
+    def timestamps(self) -> array:
+        return self._ordered(self._timestamps)
+
+    def nbytes(self) -> int:
+        return sum(
+            column.itemsize * len(column)
+            for column in (self._colors, self._numbers, self._timestamps)
+        )
+
+    def _ordered(self, column: array) -> array:
+        if self.maxlen is None or self._start == 0:
+            return column[: self._size]
+        return column[self._start : self._size] + column[: self._start]
+
+    def _slot(self, position: int) -> int:
+        if self.maxlen is None:
+            return position
+        return (self._start + position) % self.maxlen
+
+    def _row(self, position: int) -> Dict[str, Any]:
+        slot = self._slot(position)
+        number = self._numbers[slot]
+        return {
+            "timestamp": from_epoch_ms(self._timestamps[slot]),
+            "number": None if number == UNKNOWN_NUMBER else number,
+            "color": COLOR_NAMES.get(self._colors[slot]),
+        }
+
+
+def to_epoch_ms(timestamp: Any) -> int:
+    if timestamp is None:
+        return UNKNOWN_TIMESTAMP
+    if isinstance(timestamp, (int, float)):
+        value = float(timestamp)
+        return int(value if value > 1e11 else value * 1000)
+    try:
+        parsed = datetime.fromisoformat(str(timestamp).replace("Z", "+00:00"))
+    except ValueError:
+        return UNKNOWN_TIMESTAMP
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return int(round(parsed.timestamp() * 1000))
+
+
+def from_epoch_ms(value: int) -> str | None:
+    if value == UNKNOWN_TIMESTAMP:
+        return None
+    moment = datetime.fromtimestamp(value / 1000, tz=timezone.utc)
+    return moment.isoformat(timespec="milliseconds").replace("+00:00", "Z")
+
+
+def _to_number(number: Any) -> int:
+    try:
+        value = int(number)
+    except (TypeError, ValueError):
+        return UNKNOWN_NUMBER
+    if not -128 <= value <= 127:
+        return UNKNOWN_NUMBER
+    return value
@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+from collections import deque
+from typing import Any, Deque, Dict, Hashable
+
+
+class ColorWindow:
+    """Contagem de cores nos últimos N resultados, atualizada em O(1)."""
+
+    def __init__(self, size: int) -> None:
+        self.size = max(1, int(size))
+        self._items: Deque[Any] = deque(maxlen=self.size)
+        self._counts: Dict[str, int] = {}
+
+    @property
+    def key(self) -> Hashable:
+        return ("color_window", self.size)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def push(self, color: Any) -> None:
+        if len(self._items) == self.size:
+            evicted = self._items[0]
+            if evicted is not None:
+                remaining = self._counts[evicted] - 1
+                if remaining:
+                    self._counts[evicted] = remaining
+                else:
+                    del self._counts[evicted]
+        if not color:
+            color = None
+        self._items.append(color)
+        if color is not None:
+            self._counts[color] = self._counts.get(color, 0) + 1
+
+    def count(self, color: str) -> int:
+        return self._counts.get(color, 0)
+
+    def counts(self) -> Dict[str, int]:
+        return dict(self._counts)
+
+    def max_count(self) -> int:
+        return max(self._counts.values()) if self._counts else 0
+
+    def reset(self) -> None:
+        self._items.clear()
+        self._counts.clear()
+
+
+class StreakTracker:
+    """Cor e tamanho da sequência atual de resultados iguais."""
+
+    def __init__(self) -> None:
+        self.color: Any = None
+        self.length = 0
+
+    @property
+    def key(self) -> Hashable:
+        return ("streak",)
+
+    def push(self, color: Any) -> None:
+        if self.length and color == self.color:
+            self.length += 1
+            return
+        self.color = color
+        self.length = 1
+
+    def reset(self) -> None:
+        self.color = None
+        self.length = 0
+
+
+class WhiteGapTracker:
+    """Quantidade de rodadas desde o último branco."""
+
+    def __init__(self) -> None:
+        self.gap = 0
+
+    @property
+    def key(self) -> Hashable:
+        return ("white_gap",)
+
+    def push(self, color: Any) -> None:
+        if color == "white":
+            self.gap = 0
+        else:
+            self.gap += 1
+
+    def reset(self) -> None:
+        self.gap = 0
@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+import csv
+import itertools
+import random
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping, Sequence
+
+from blaze_bot.core.backtest import run_backtest
+from blaze_bot.core.history import RollHistory
+from blaze_bot.core.vectorized import run_backtest_vectorized, supports_vectorized
+from blaze_bot.data.recordings import iter_history
+from blaze_bot.data.rollfile import RollFile, is_roll_file
+from blaze_bot.games.strategies import available_strategies
+from blaze_bot.strategies.base import StrategyBase
+
+_worker_history: RollHistory | None = None
+
+
+def expand_grid(grid: Mapping[str, Sequence[Any]]) -> List[Dict[str, Any]]:
+    """Todas as combinações de um grid {CONSTANTE: [valores]}."""
+    names = list(grid)
+    return [
+        dict(zip(names, values))
+        for values in itertools.product(*(list(grid[name]) for name in names))
+    ]
+
+
+def sample_random(
+    space: Mapping[str, Any], samples: int, *, seed: int | None = None
+) -> List[Dict[str, Any]]:
+    """Sorteia combinações: listas viram escolha, {"min", "max"} vira intervalo."""
+    rng = random.Random(seed)
+    variants = []
+    for _ in range(samples):
+        variant: Dict[str, Any] = {}
+        for name, domain in space.items():
+            if isinstance(domain, Mapping):
+                low, high = domain["min"], domain["max"]
+                if isinstance(low, int) and isinstance(high, int):
+                    variant[name] = rng.randint(low, high)
+                else:
+                    variant[name] = rng.uniform(float(low), float(high))
+            else:
+                variant[name] = rng.choice(list(domain))
+        variants.append(variant)
+    return variants
+
+
+def variants_from_spec(spec: Mapping[str, Any]) -> List[Dict[str, Any]]:
+    if "grid" in spec:
+        return expand_grid(spec["grid"])
+    if "random" in spec:
+        return sample_random(
+            spec["random"], int(spec.get("samples", 20)), seed=spec.get("seed")
+        )
+    raise ValueError("Especificação de sweep precisa de 'grid' ou 'random'.")
+
+
+def build_variant(
+    strategy_package: str, strategy_key: str, overrides: Mapping[str, Any]
+) -> StrategyBase:
+    """Instancia a estratégia com constantes de classe sobrescritas."""
+    strategy_class = available_strategies(strategy_package).get(strategy_key.lower())
+    if strategy_class is None:
+        raise ValueError(f"Estratégia não encontrada: {strategy_key}")
+    invalid = [
+        name for name in overrides if not name.isupper() or not hasattr(strategy_class, name)
+    ]
+    if invalid:
+        raise ValueError(
+            f"Parâmetros inválidos para {strategy_key}: {', '.join(sorted(invalid))}"
+        )
+    variant_class = type(
+        strategy_class.__name__,
+        (strategy_class,),
+        {"__module__": strategy_class.__module__, **overrides},
+    )
+    return variant_class()
+
+
+def run_sweep(
+    strategy_package: str,
+    strategy_key: str,
+    variants: Iterable[Mapping[str, Any]],
+    history: Path | Iterable[Dict[str, Any]],
+    *,
+    workers: int | None = None,
+    vectorized: bool = False,
+    min_entries: float = 1,
+) -> List[Dict[str, Any]]:
+    """Roda um backtest por variante em paralelo e devolve o ranking por winrate.
+
+    O histórico é carregado uma única vez por processo (no initializer do
+    pool) em um RollHistory compacto, em vez de ser serializado por tarefa.
+    """
+    variants = [dict(variant) for variant in variants]
+    for variant in variants:
+        build_variant(strategy_package, strategy_key, variant)
+    source: Path | List[Dict[str, Any]] = (
+        history if isinstance(history, Path) else list(history)
+    )
+    tasks = [(strategy_package, strategy_key, variant, vectorized) for variant in variants]
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_worker, initargs=(source,)
+    ) as executor:
+        results = list(executor.map(_run_variant, tasks, chunksize=_chunksize(len(tasks), workers)))
+    return rank_results(results, min_entries=min_entries)
+
+
+def rank_results(
+    results: Iterable[Dict[str, Any]], *, min_entries: float = 1
+) -> List[Dict[str, Any]]:
+    eligible = [item for item in results if item["entries"] >= min_entries]
+    eligible.sort(key=lambda item: (item["winrate"], item["entries"]), reverse=True)
+    for rank, item in enumerate(eligible, start=1):
+        item["rank"] = rank
+    return eligible
+
+
+def write_results(path: Path, ranked: Sequence[Dict[str, Any]]) -> None:
+    param_names = sorted({name for item in ranked for name in item["params"]})
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", encoding="utf-8", newline="") as handle:
+        writer = csv.writer(handle)
+        writer.writerow(["rank", *param_names, "entries", "wins", "losses", "winrate"])
+        for item in ranked:
+            writer.writerow(
+                [
+                    item["rank"],
+                    *(item["params"].get(name, "") for name in param_names),
+                    item["entries"],
+                    item["wins"],
+                    item["losses"],
+                    f"{item['winrate']:.4f}",
+                ]
+            )
+
+
+def _init_worker(source: Path | List[Dict[str, Any]]) -> None:
+    global _worker_history
+    if isinstance(source, Path) and is_roll_file(source):
+        with RollFile(source) as roll_file:
+            _worker_history = roll_file.to_history()
+        return
+    records = iter_history(source) if isinstance(source, Path) else source
+    _worker_history = RollHistory(records)
+
+
+def _run_variant(task: tuple[str, str, Dict[str, Any], bool]) -> Dict[str, Any]:
+    strategy_package, strategy_key, overrides, vectorized = task
+    strategy = build_variant(strategy_package, strategy_key, overrides)
+    if _worker_history is None:
+        raise RuntimeError("Histórico do sweep não inicializado.")
+    if vectorized and supports_vectorized(strategy):
+        results = run_backtest_vectorized(strategy, _worker_history)
+    else:
+        results = run_backtest(strategy, _worker_history)
+    return {
+        "params": overrides,
+        "entries": results["entries"],
+        "wins": results["wins"],
+        "losses": results["losses"],
+        "winrate": results["winrate"],
+    }
+
+
+def _chunksize(task_count: int, workers: int | None) -> int:
+    workers = workers or 4
+    return max(1, task_count // (workers * 4))
@@ -0,0 +1,220 @@
+from __future__ import annotations
+
+from array import array
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List
+
+from blaze_bot.core.backtest import run_backtest
+from blaze_bot.core.history import COLOR_CODES, UNKNOWN_COLOR, RollHistory
+from blaze_bot.core.stats import Stats
+from blaze_bot.data.rollfile import RollFile
+from blaze_bot.strategies.base import StrategyBase
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - dependência opcional
+    np = None
+
+WHITE = COLOR_CODES["white"]
+RED = COLOR_CODES["red"]
+BLACK = COLOR_CODES["black"]
+NO_COLOR = UNKNOWN_COLOR
+
+
+@dataclass
+class SignalArrays:
+    """Sinais calculados para todas as rodadas de uma vez.
+
+    ``mask[i]`` indica que a estratégia sinaliza após a rodada ``i`` apostando
+    em ``color[i]`` (e em ``hedge[i]``, quando a predição é um bet_split).
+    """
+
+    mask: Any
+    color: Any
+    hedge: Any = None
+    win_weight: float = 1.0
+    loss_weight: float = 1.0
+
+
+def numpy_available() -> bool:
+    return np is not None
+
+
+def supports_vectorized(strategy: StrategyBase) -> bool:
+    return np is not None and all(
+        hasattr(lane, "signal_kernel") for lane in strategy.lanes()
+    )
+
+
+def color_codes(history: Any) -> Any:
+    """Converte o histórico para um array int8 de cores (0=branco, 1=vermelho, 2=preto)."""
+    _require_numpy()
+    if isinstance(history, np.ndarray):
+        return history.astype(np.int8, copy=False)
+    if isinstance(history, RollHistory):
+        return np.frombuffer(history.color_codes(), dtype=np.int8)
+    if isinstance(history, RollFile):
+        return history.colors()
+    codes = array("b", (COLOR_CODES.get(item.get("color"), NO_COLOR) for item in history))
+    return np.frombuffer(codes, dtype=np.int8)
+
+
+def rolling_count(colors: Any, code: int, window: int) -> Any:
+    """Quantidade de ``code`` nas últimas ``window`` rodadas, terminando em cada i."""
+    cumulative = np.cumsum(colors == code, dtype=np.int64)
+    counts = cumulative.copy()
+    counts[window:] -= cumulative[:-window]
+    return counts
+
+
+def warmed_up(colors: Any, window: int) -> Any:
+    """True nas rodadas em que já existem ``window`` resultados."""
+    return np.arange(1, len(colors) + 1) >= window
+
+
+def streak_lengths(colors: Any) -> Any:
+    """Tamanho da sequência de cores iguais que termina em cada rodada."""
+    size = len(colors)
+    if not size:
+        return np.zeros(0, dtype=np.int64)
+    positions = np.arange(size)
+    changed = np.ones(size, dtype=bool)
+    changed[1:] = colors[1:] != colors[:-1]
+    starts = np.maximum.accumulate(np.where(changed, positions, 0))
+    return positions - starts + 1
+
+
+def white_gaps(colors: Any) -> Any:
+    """Rodadas desde o último branco (inclusive a atual), como WhiteGapTracker."""
+    positions = np.arange(len(colors))
+    last_white = np.maximum.accumulate(np.where(colors == WHITE, positions, -1))
+    return positions - last_white
+
+
+def run_lengths(mask: Any) -> Any:
+    """Tamanho da sequência de valores True que termina em cada posição."""
+    size = len(mask)
+    positions = np.arange(size)
+    last_false = np.maximum.accumulate(np.where(mask, -1, positions))
+    return positions - last_false
+
+
+def choose(condition: Any, when_true: int, when_false: int) -> Any:
+    return np.where(condition, when_true, when_false).astype(np.int8)
+
+
+def no_signals(colors: Any) -> Any:
+    return np.zeros(len(colors), dtype=bool)
+
+
+def filled(colors: Any, code: int) -> Any:
+    return np.full(len(colors), code, dtype=np.int8)
+
+
+def maximum(first: Any, second: Any) -> Any:
+    return np.maximum(first, second)
+
+
+def first_at_or_after(positions: Any, start: int) -> int | None:
+    """Primeira posição (ordenada) >= ``start`` ou None."""
+    index = int(np.searchsorted(positions, start))
+    if index >= len(positions):
+        return None
+    return int(positions[index])
+
+
+def run_backtest_vectorized(
+    strategy: StrategyBase, history: Iterable[Dict[str, Any]] | Any
+) -> Dict[str, Any]:
+    """Backtest em lote para estratégias com ``signal_kernel``.
+
+    Produz o mesmo resultado de ``run_backtest``: cada lane (estratégia) é
+    liquidada de forma independente e somada ao total. Se alguma estratégia
+    não tiver kernel (ou o NumPy não estiver instalado) usa o caminho padrão.
+    """
+    if not supports_vectorized(strategy):
+        return run_backtest(strategy, history)
+    colors = color_codes(history)
+    total = Stats()
+    per_strategy: Dict[str, Any] = {}
+    for lane in strategy.lanes():
+        signals = lane.signal_kernel(colors)
+        stats, settled = _settle(signals, colors, lane.martingale_limit())
+        if not settled:
+            continue
+        total.total_entries += stats.total_entries
+        total.wins += stats.wins
+        total.losses += stats.losses
+        per_strategy[lane.strategy_name()] = {
+            "entries": stats.total_entries,
+            "wins": stats.wins,
+            "losses": stats.losses,
+            "winrate": stats.winrate,
+        }
+    return {
+        "rolls": int(len(colors)),
+        "entries": total.total_entries,
+        "wins": total.wins,
+        "losses": total.losses,
+        "winrate": total.winrate,
+        "per_strategy": per_strategy,
+    }
+
+
+def _settle(signals: SignalArrays, colors: Any, martingale: int) -> tuple[Stats, int]:
+    size = len(colors)
+    mask = np.array(signals.mask, dtype=bool)
+    if size:
+        mask[-1] = False
+    hits = [_hits(signals, colors, offset) for offset in range(1, martingale + 2)]
+    taken = _taken_signals(mask, hits, martingale)
+    first_hits = hits[0][taken]
+    win_count = int(np.count_nonzero(first_hits))
+    loss_count = int(len(taken) - win_count)
+    win_weight = 1.0 if signals.hedge is not None else float(signals.win_weight)
+    loss_weight = 1.0 if signals.hedge is not None else float(signals.loss_weight)
+    stats = Stats(
+        total_entries=win_count * win_weight + loss_count * loss_weight,
+        wins=win_count * win_weight,
+        losses=loss_count * loss_weight,
+    )
+    return stats, len(taken)
+
+
+def _hits(signals: SignalArrays, colors: Any, offset: int) -> Any:
+    size = len(colors)
+    hits = np.zeros(size, dtype=bool)
+    if offset >= size:
+        return hits
+    upcoming = colors[offset:]
+    hits[:-offset] = upcoming == signals.color[:-offset]
+    if signals.hedge is not None:
+        hits[:-offset] |= upcoming == signals.hedge[:-offset]
+    return hits
+
+
+def _taken_signals(mask: Any, hits: List[Any], martingale: int) -> Any:
+    candidates = np.flatnonzero(mask)
+    if martingale == 0 or not len(candidates):
+        return candidates
+    size = len(mask)
+    steps = np.full(size, martingale + 1, dtype=np.int64)
+    for offset in range(martingale + 1, 0, -1):
+        steps[hits[offset - 1]] = offset
+    next_candidate = np.full(size + 1, size, dtype=np.int64)
+    next_candidate[candidates] = candidates
+    next_candidate = np.minimum.accumulate(next_candidate[::-1])[::-1]
+    taken: List[int] = []
+    index = int(next_candidate[0])
+    while index < size:
+        taken.append(index)
+        free_at = index + int(steps[index])
+        if free_at >= size:
+            break
+        index = int(next_candidate[free_at])
+    return np.asarray(taken, dtype=np.int64)
+
+
+def _require_numpy() -> None:
+    if np is None:
+        raise ImportError("NumPy é necessário para o backtest vetorizado (pip install numpy).")
@@ -0,0 +1,299 @@
+from __future__ import annotations
+
+import logging
+import sqlite3
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List
+
+from blaze_bot.core.history import (
+    COLOR_CODES,
+    COLOR_NAMES,
+    UNKNOWN_COLOR,
+    UNKNOWN_NUMBER,
+    UNKNOWN_TIMESTAMP,
+    _to_number,
+    from_epoch_ms,
+    to_epoch_ms,
+)
+from blaze_bot.data.recordings import iter_history
+
+logger = logging.getLogger(__name__)
+
+ROLL_INTERVAL_MS = 30_000
+# Intervalo a partir do qual se considera que faltam rodadas entre duas gravadas.
+GAP_THRESHOLD_MS = ROLL_INTERVAL_MS * 3 // 2
+INGEST_BATCH = 5000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id INTEGER PRIMARY KEY,
+    source TEXT NOT NULL UNIQUE,
+    size INTEGER NOT NULL DEFAULT 0,
+    rolls INTEGER NOT NULL DEFAULT 0,
+    inserted INTEGER NOT NULL DEFAULT 0,
+    skipped INTEGER NOT NULL DEFAULT 0,
+    first_timestamp INTEGER,
+    last_timestamp INTEGER,
+    gaps INTEGER NOT NULL DEFAULT 0,
+    missing INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS rolls (
+    timestamp INTEGER NOT NULL,
+    number INTEGER NOT NULL,
+    color INTEGER NOT NULL,
+    session_id INTEGER NOT NULL REFERENCES sessions(id),
+    PRIMARY KEY (timestamp, number, color)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS rolls_session ON rolls (session_id, timestamp);
+"""
+
+
+@dataclass
+class SessionInfo:
+    """Entrada do catálogo: um arquivo de gravação ingerido no arquivo."""
+
+    source: str
+    rolls: int
+    inserted: int
+    skipped: int
+    first_timestamp: str | None
+    last_timestamp: str | None
+    gaps: int
+    missing: int
+
+    @property
+    def duplicates(self) -> int:
+        """Rodadas do arquivo que já estavam no arquivo por outra sessão."""
+        return self.rolls - self.inserted - self.skipped
+
+
+class RollArchive:
+    """Arquivo SQLite (WAL) com todas as rodadas gravadas, sem duplicatas.
+
+    Cada gravação ingerida vira uma sessão no catálogo; as rodadas ficam em
+    uma tabela ordenada por timestamp e indexada por sessão, com chave
+    ``(timestamp, number, color)``, então sessões concorrentes ou redundantes
+    que gravaram a mesma rodada guardam uma única cópia. Rodadas sem
+    timestamp não podem ser ordenadas e são ignoradas (``skipped``).
+
+    ``iter_range`` lê um intervalo sob demanda, em ordem cronológica, no
+    mesmo formato do JSONL, e pode ser passado direto para ``run_backtest``.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._connection = sqlite3.connect(path)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.executescript(_SCHEMA)
+
+    def ingest(self, path: Path, *, force: bool = False) -> SessionInfo | None:
+        """Importa uma gravação (JSONL, .gz/.xz ou .rolls).
+
+        Arquivos já importados com o mesmo tamanho são pulados (devolve
+        ``None``) a menos que ``force`` seja verdadeiro; reimportar nunca
+        duplica rodadas.
+        """
+        source = source_name(path)
+        size = path.stat().st_size
+        row = self._connection.execute(
+            "SELECT id, size FROM sessions WHERE source = ?", (source,)
+        ).fetchone()
+        if row is not None and row[1] == size and not force:
+            return None
+        with self._connection:
+            if row is None:
+                session_id = self._connection.execute(
+                    "INSERT INTO sessions (source, size) VALUES (?, ?)", (source, size)
+                ).lastrowid
+            else:
+                session_id = row[0]
+            counters = _IngestCounters()
+            batch: List[tuple[int, int, int, int]] = []
+            for result in iter_history(path):
+                record = counters.register(result)
+                if record is None:
+                    continue
+                batch.append((*record, session_id))
+                if len(batch) >= INGEST_BATCH:
+                    counters.inserted += self._insert(batch)
+                    batch.clear()
+            counters.inserted += self._insert(batch)
+            self._connection.execute(
+                """
+                UPDATE sessions SET size = ?, rolls = ?, inserted = inserted + ?, skipped = ?,
+                    first_timestamp = ?, last_timestamp = ?, gaps = ?, missing = ?
+                WHERE id = ?
+                """,
+                (
+                    size,
+                    counters.rolls,
+                    counters.inserted,
+                    counters.skipped,
+                    counters.first,
+                    counters.last,
+                    counters.gaps,
+                    counters.missing,
+                    session_id,
+                ),
+            )
+        logger.info(
+            "%s: %d rodada(s), %d nova(s), %d lacuna(s).",
+            source,
+            counters.rolls,
+            counters.inserted,
+            counters.gaps,
+        )
+        return self.session(source)
+
+    def ingest_many(self, paths: Iterable[Path], *, force: bool = False) -> List[SessionInfo]:
+        """Importa arquivos e diretórios (gravações ``backtest_*`` dentro deles)."""
+        ingested: List[SessionInfo] = []
+        for path in paths:
+            candidates = sorted(path.glob("backtest_*")) if path.is_dir() else [path]
+            for candidate in candidates:
+                if candidate.name.endswith(".tmp"):
+                    continue
+                info = self.ingest(candidate, force=force)
+                if info is not None:
+                    ingested.append(info)
+        return ingested
+
+    def iter_range(
+        self,
+        start: Any = None,
+        end: Any = None,
+        *,
+        source: str | None = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """Rodadas com ``start <= timestamp < end`` em ordem cronológica.
+
+        ``start``/``end`` aceitam o mesmo que o campo ``timestamp`` (texto
+        ISO ou epoch) e ``None`` deixa o lado aberto; ``source`` limita às
+        rodadas que a sessão trouxe primeiro (as duplicadas ficam com a sessão
+        que as gravou antes). O cursor é lido sob demanda.
+        """
+        where, params = _where(start, end, source)
+        cursor = self._connection.execute(
+            f"SELECT timestamp, number, color FROM rolls {where} ORDER BY timestamp, number, color",
+            params,
+        )
+        try:
+            for timestamp, number, color in cursor:
+                yield {
+                    "timestamp": from_epoch_ms(timestamp),
+                    "number": None if number == UNKNOWN_NUMBER else number,
+                    "color": COLOR_NAMES.get(color),
+                }
+        finally:
+            cursor.close()
+
+    def count(self, start: Any = None, end: Any = None, *, source: str | None = None) -> int:
+        where, params = _where(start, end, source)
+        return self._connection.execute(f"SELECT COUNT(*) FROM rolls {where}", params).fetchone()[0]
+
+    def session(self, source: str) -> SessionInfo | None:
+        row = self._connection.execute(
+            f"SELECT {_SESSION_COLUMNS} FROM sessions WHERE source = ?", (source,)
+        ).fetchone()
+        return _session_info(row) if row is not None else None
+
+    def sessions(self) -> List[SessionInfo]:
+        rows = self._connection.execute(
+            f"SELECT {_SESSION_COLUMNS} FROM sessions ORDER BY first_timestamp, source"
+        ).fetchall()
+        return [_session_info(row) for row in rows]
+
+    def close(self) -> None:
+        self._connection.close()
+
+    def __enter__(self) -> "RollArchive":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def _insert(self, batch: List[tuple[int, int, int, int]]) -> int:
+        if not batch:
+            return 0
+        before = self._connection.total_changes
+        self._connection.executemany(
+            "INSERT OR IGNORE INTO rolls (timestamp, number, color, session_id) VALUES (?, ?, ?, ?)",
+            batch,
+        )
+        return self._connection.total_changes - before
+
+
+def source_name(path: Path) -> str:
+    """Nome da sessão no catálogo: o arquivo sem a extensão de compressão.
+
+    Assim o segmento ainda aberto (``.jsonl``) e o mesmo segmento depois de
+    comprimido (``.jsonl.xz``) são a mesma sessão.
+    """
+    if path.suffix.lower() in {".gz", ".xz"}:
+        return path.stem
+    return path.name
+
+
+def _where(start: Any, end: Any, source: str | None) -> tuple[str, List[Any]]:
+    clauses: List[str] = []
+    params: List[Any] = []
+    if start is not None:
+        clauses.append("timestamp >= ?")
+        params.append(to_epoch_ms(start))
+    if end is not None:
+        clauses.append("timestamp < ?")
+        params.append(to_epoch_ms(end))
+    if source is not None:
+        clauses.append("session_id = (SELECT id FROM sessions WHERE source = ?)")
+        params.append(source)
+    return (f"WHERE {' AND '.join(clauses)}" if clauses else ""), params
+
+
+_SESSION_COLUMNS = (
+    "source, rolls, inserted, skipped, first_timestamp, last_timestamp, gaps, missing"
+)
+
+
+def _session_info(row: tuple[Any, ...]) -> SessionInfo:
+    source, rolls, inserted, skipped, first, last, gaps, missing = row
+    return SessionInfo(
+        source=source,
+        rolls=rolls,
+        inserted=inserted,
+        skipped=skipped,
+        first_timestamp=from_epoch_ms(first) if first is not None else None,
+        last_timestamp=from_epoch_ms(last) if last is not None else None,
+        gaps=gaps,
+        missing=missing,
+    )
+
+
+class _IngestCounters:
+    def __init__(self) -> None:
+        self.rolls = 0
+        self.inserted = 0
+        self.skipped = 0
+        self.gaps = 0
+        self.missing = 0
+        self.first: int | None = None
+        self.last: int | None = None
+
+    def register(self, result: Dict[str, Any]) -> tuple[int, int, int] | None:
+        self.rolls += 1
+        timestamp = to_epoch_ms(result.get("timestamp"))
+        if timestamp == UNKNOWN_TIMESTAMP:
+            self.skipped += 1
+            return None
+        self.first = timestamp if self.first is None else min(self.first, timestamp)
+        if self.last is not None and timestamp - self.last >= GAP_THRESHOLD_MS:
+            self.gaps += 1
+            self.missing += round((timestamp - self.last) / ROLL_INTERVAL_MS) - 1
+        self.last = timestamp if self.last is None else max(self.last, timestamp)
+        return (
+            timestamp,
+            _to_number(result.get("number")),
+            COLOR_CODES.get(result.get("color"), UNKNOWN_COLOR),
+        )
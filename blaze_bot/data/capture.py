@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from pathlib import Path
+from typing import Any, AsyncGenerator, Dict, Iterator
+
+from blaze_bot.data.recordings import open_recording
+from blaze_bot.data.websocket_double import BlazeDoubleWebSocket
+
+logger = logging.getLogger(__name__)
+
+
+class FrameCapture:
+    """Grava os frames brutos recebidos, um por linha: ``<epoch_ms>\\t<frame>``.
+
+    Aceita .gz/.xz como os demais arquivos de histórico. O arquivo é
+    bufferizado e só recebe ``flush`` a cada ``flush_every`` frames e no
+    ``close``, para não pesar na leitura do socket.
+    """
+
+    def __init__(self, path: Path, *, flush_every: int = 100) -> None:
+        self.path = path
+        self.flush_every = max(1, flush_every)
+        self.frames = 0
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._handle = open_recording(path, "at")
+
+    def write(self, frame: str, received_at: float | None = None) -> None:
+        received_ms = int((received_at if received_at is not None else time.time()) * 1000)
+        self._handle.write(f"{received_ms}\t{frame}\n")
+        self.frames += 1
+        if self.frames % self.flush_every == 0:
+            self._handle.flush()
+
+    def close(self) -> None:
+        if not self._handle.closed:
+            self._handle.close()
+
+
+def iter_frames(path: Path) -> Iterator[tuple[float, str]]:
+    """Lê uma captura como ``(recebido_em_segundos, frame)``.
+
+    Linhas sem timestamp (um frame puro por linha) são aceitas com tempo 0.
+    """
+    with open_recording(path) as handle:
+        for line in handle:
+            line = line.rstrip("\n")
+            if not line:
+                continue
+            prefix, separator, frame = line.partition("\t")
+            if separator and prefix.isdigit():
+                yield int(prefix) / 1000, frame
+            else:
+                yield 0.0, line
+
+
+class ReplaySource:
+    """Reproduz uma captura pelo mesmo parser do socket ao vivo.
+
+    Com ``speed`` 1 respeita os intervalos originais, com 10 reproduz dez
+    vezes mais rápido e com 0 (ou menos) entrega tudo o mais rápido
+    possível. Tem a mesma interface ``listen()`` do ``BlazeDoubleWebSocket``.
+    """
+
+    def __init__(self, path: Path, *, speed: float = 1.0, parser: Any = None) -> None:
+        self.path = path
+        self.speed = speed
+        self.parser = parser or BlazeDoubleWebSocket(f"replay://{path.name}")
+        self.frames = 0
+        self.results = 0
+
+    async def listen(self) -> AsyncGenerator[Dict[str, Any], None]:
+        previous: float | None = None
+        for received_at, frame in iter_frames(self.path):
+            if self.speed > 0 and previous is not None and received_at > previous:
+                await asyncio.sleep((received_at - previous) / self.speed)
+            previous = received_at
+            self.frames += 1
+            parsed = self.parser._parse_message(frame)
+            if parsed:
+                self.results += 1
+                yield parsed
+            elif self.speed <= 0 and self.frames % 1000 == 0:
+                await asyncio.sleep(0)
+        logger.info(
+            "Replay de %s concluído: %d frames, %d resultados.", self.path, self.frames, self.results
+        )
+
+    def metrics(self) -> Dict[str, Any]:
+        return {"frames": self.frames, "results": self.results}
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import Any, Dict, Hashable
+
+
+class RecentSignatures:
+    """Conjunto limitado das últimas assinaturas de rodadas, com busca O(1).
+
+    A assinatura é ``(number, color, timestamp)``. Guarda as ``capacity``
+    mais recentes (a mais antiga sai primeiro), o que cobre re-broadcasts,
+    replays após reconexão e cópias vindas de conexões redundantes. Um
+    resultado novo com timestamp anterior ao mais recente já visto é contado
+    como fora de ordem (ele ainda é entregue).
+    """
+
+    def __init__(self, capacity: int = 256) -> None:
+        self.capacity = max(1, capacity)
+        self.duplicates = 0
+        self.out_of_order = 0
+        self._entries: OrderedDict[Hashable, Any] = OrderedDict()
+        self._latest_timestamp: Any = None
+
+    def add(self, signature: tuple[Any, ...], info: Any = None) -> bool:
+        """Registra a assinatura; False se ela já estava na janela."""
+        if signature in self._entries:
+            self.duplicates += 1
+            return False
+        self._entries[signature] = info
+        if len(self._entries) > self.capacity:
+            self._entries.popitem(last=False)
+        timestamp = signature[-1]
+        if self._latest_timestamp is None or _is_after(timestamp, self._latest_timestamp):
+            self._latest_timestamp = timestamp
+        elif timestamp != self._latest_timestamp:
+            self.out_of_order += 1
+        return True
+
+    def get(self, signature: tuple[Any, ...]) -> Any:
+        return self._entries.get(signature)
+
+    def snapshot(self) -> Dict[str, int]:
+        return {
+            "size": len(self._entries),
+            "duplicates": self.duplicates,
+            "out_of_order": self.out_of_order,
+        }
+
+    def __contains__(self, signature: object) -> bool:
+        return signature in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def result_signature(result: Dict[str, Any]) -> tuple[Any, ...]:
+    return (result.get("number"), result.get("color"), result.get("timestamp"))
+
+
+def _is_after(timestamp: Any, latest: Any) -> bool:
+    try:
+        return timestamp > latest
+    except TypeError:
+        return True
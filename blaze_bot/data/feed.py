@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict
+
+logger = logging.getLogger(__name__)
+
+OVERFLOW_DROP_OLDEST = "drop_oldest"
+OVERFLOW_DROP_NEWEST = "drop_newest"
+OVERFLOW_BLOCK = "block"
+OVERFLOW_POLICIES = (OVERFLOW_DROP_OLDEST, OVERFLOW_DROP_NEWEST, OVERFLOW_BLOCK)
+
+_END = object()
+
+
+@dataclass
+class FeedMetrics:
+    received: int = 0
+    delivered: int = 0
+    dropped: int = 0
+    max_depth: int = 0
+    last_lag: float | None = None
+    avg_lag: float | None = None
+    max_lag: float = 0.0
+
+    def register_lag(self, lag: float) -> None:
+        self.delivered += 1
+        self.last_lag = lag
+        self.max_lag = max(self.max_lag, lag)
+        if self.avg_lag is None:
+            self.avg_lag = lag
+        else:
+            self.avg_lag = (self.avg_lag * 0.9) + (lag * 0.1)
+
+
+class ResultFeed:
+    """Fila limitada entre a task que lê o socket e o consumidor (Engine).
+
+    ``run`` consome a fonte (ex.: ``BlazeDoubleWebSocket.listen()``) em uma
+    task própria, então pings do Engine.IO continuam sendo respondidos mesmo
+    com o consumidor ocupado. Quando a fila enche, ``overflow`` decide o que
+    fazer: ``drop_oldest`` descarta o resultado mais antigo, ``drop_newest``
+    descarta o que acabou de chegar e ``block`` segura a leitura até haver
+    espaço (o que também atrasa os pongs). O lag é o tempo entre a chegada do
+    resultado e sua retirada pelo consumidor.
+    """
+
+    def __init__(self, *, maxsize: int = 100, overflow: str = OVERFLOW_DROP_OLDEST) -> None:
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(
+                f"Política de overflow inválida: {overflow} (use {', '.join(OVERFLOW_POLICIES)})"
+            )
+        self.maxsize = max(1, maxsize)
+        self.overflow = overflow
+        self.metrics = FeedMetrics()
+        # Sem limite no asyncio.Queue: o limite é aplicado em ``put`` para que
+        # o marcador de fim sempre caiba sem descartar resultados.
+        self._queue: asyncio.Queue[tuple[float, Any]] = asyncio.Queue()
+        self._space = asyncio.Event()
+        self._ended = False
+
+    async def run(self, source: AsyncIterator[Dict[str, Any]]) -> None:
+        try:
+            async for result in source:
+                await self.put(result)
+        finally:
+            self.close()
+
+    async def put(self, result: Dict[str, Any]) -> None:
+        self.metrics.received += 1
+        item = (time.monotonic(), result)
+        if self.overflow == OVERFLOW_BLOCK:
+            while self._queue.qsize() >= self.maxsize:
+                self._space.clear()
+                await self._space.wait()
+            self._queue.put_nowait(item)
+        elif self._queue.qsize() >= self.maxsize:
+            self.metrics.dropped += 1
+            if self.overflow == OVERFLOW_DROP_NEWEST:
+                logger.warning("Fila de resultados cheia (%d); resultado descartado.", self.maxsize)
+                return
+            self._queue.get_nowait()
+            logger.warning(
+                "Fila de resultados cheia (%d); resultado mais antigo descartado.", self.maxsize
+            )
+            self._queue.put_nowait(item)
+        else:
+            self._queue.put_nowait(item)
+        self.metrics.max_depth = max(self.metrics.max_depth, self._queue.qsize())
+
+    async def get(self) -> Dict[str, Any] | None:
+        """Próximo resultado, ou None quando a fonte terminou."""
+        received_at, result = await self._queue.get()
+        self._space.set()
+        if result is _END:
+            self._queue.put_nowait((received_at, _END))
+            return None
+        self.metrics.register_lag(time.monotonic() - received_at)
+        return result
+
+    def depth(self) -> int:
+        return self._queue.qsize()
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "depth": self.depth(),
+            "received": self.metrics.received,
+            "delivered": self.metrics.delivered,
+            "dropped": self.metrics.dropped,
+            "max_depth": self.metrics.max_depth,
+            "last_lag": self.metrics.last_lag,
+            "avg_lag": self.metrics.avg_lag,
+            "max_lag": self.metrics.max_lag,
+        }
+
+    def close(self) -> None:
+        """Sinaliza o fim da fonte; ``get`` devolve None depois dos pendentes."""
+        if self._ended:
+            return
+        self._ended = True
+        self._queue.put_nowait((time.monotonic(), _END))
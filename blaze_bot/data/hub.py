@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Hashable, List
+
+from blaze_bot.data.feed import OVERFLOW_DROP_OLDEST, ResultFeed
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _Channel:
+    socket: Any
+    feeds: List[ResultFeed] = field(default_factory=list)
+    task: asyncio.Task[None] | None = None
+    delivered: int = 0
+
+
+class ConnectionHub:
+    """Um socket por chave (ex.: jogo + url + sala) compartilhado entre sessões.
+
+    Cada ``subscribe`` devolve um ``ResultFeed`` próprio; a task do canal lê
+    o socket uma única vez e copia cada resultado para todas as filas
+    inscritas. Com a política ``block`` uma sessão lenta segura as demais do
+    mesmo canal; com ``drop_*`` cada fila transborda de forma independente.
+    """
+
+    def __init__(self) -> None:
+        self._channels: Dict[Hashable, _Channel] = {}
+
+    def subscribe(
+        self,
+        key: Hashable,
+        socket_factory: Callable[[], Any],
+        *,
+        maxsize: int = 100,
+        overflow: str = OVERFLOW_DROP_OLDEST,
+    ) -> ResultFeed:
+        channel = self._channels.get(key)
+        if channel is None:
+            channel = _Channel(socket=socket_factory())
+            self._channels[key] = channel
+            channel.task = asyncio.create_task(self._fan_out(key, channel))
+            logger.info("Canal %s aberto.", key)
+        feed = ResultFeed(maxsize=maxsize, overflow=overflow)
+        channel.feeds.append(feed)
+        return feed
+
+    def unsubscribe(self, key: Hashable, feed: ResultFeed) -> None:
+        channel = self._channels.get(key)
+        if channel is None or feed not in channel.feeds:
+            return
+        channel.feeds.remove(feed)
+        if not channel.feeds:
+            if channel.task is not None:
+                channel.task.cancel()
+            del self._channels[key]
+            logger.info("Canal %s fechado (sem inscritos).", key)
+
+    async def close(self) -> None:
+        tasks = [channel.task for channel in self._channels.values() if channel.task is not None]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._channels.clear()
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            str(key): {
+                "subscribers": len(channel.feeds),
+                "delivered": channel.delivered,
+                **(channel.socket.metrics() if hasattr(channel.socket, "metrics") else {}),
+            }
+            for key, channel in self._channels.items()
+        }
+
+    async def _fan_out(self, key: Hashable, channel: _Channel) -> None:
+        try:
+            async for result in channel.socket.listen():
+                channel.delivered += 1
+                for feed in list(channel.feeds):
+                    await feed.put(dict(result))
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Leitura do canal %s falhou.", key)
+            raise
+        finally:
+            if hasattr(channel.socket, "metrics"):
+                logger.info("Métricas do canal %s: %s", key, channel.socket.metrics())
+            if hasattr(channel.socket, "close"):
+                channel.socket.close()
+            for feed in channel.feeds:
+                feed.close()
@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import csv
+import heapq
+import json
+import logging
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List
+
+from blaze_bot.core.history import UNKNOWN_TIMESTAMP, from_epoch_ms, to_epoch_ms
+from blaze_bot.data.archive import GAP_THRESHOLD_MS, ROLL_INTERVAL_MS
+from blaze_bot.data.recordings import iter_history, open_recording
+from blaze_bot.data.rollfile import RollWriter, is_roll_file
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Gap:
+    """Intervalo sem rodadas entre duas gravadas (``missing`` pela cadência)."""
+
+    start: int
+    end: int
+    missing: int
+
+    def to_row(self) -> Dict[str, Any]:
+        return {
+            "start": from_epoch_ms(self.start),
+            "end": from_epoch_ms(self.end),
+            "seconds": (self.end - self.start) / 1000,
+            "missing": self.missing,
+        }
+
+
+@dataclass
+class MergeReport:
+    files: int = 0
+    read: int = 0
+    written: int = 0
+    duplicates: int = 0
+    skipped: int = 0
+    out_of_order: int = 0
+    first_timestamp: int | None = None
+    last_timestamp: int | None = None
+    gaps: List[Gap] = field(default_factory=list)
+
+    @property
+    def missing(self) -> int:
+        return sum(gap.missing for gap in self.gaps)
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "files": self.files,
+            "read": self.read,
+            "written": self.written,
+            "duplicates": self.duplicates,
+            "skipped": self.skipped,
+            "out_of_order": self.out_of_order,
+            "first_timestamp": from_epoch_ms(self.first_timestamp)
+            if self.first_timestamp is not None
+            else None,
+            "last_timestamp": from_epoch_ms(self.last_timestamp)
+            if self.last_timestamp is not None
+            else None,
+            "gaps": len(self.gaps),
+            "missing": self.missing,
+        }
+
+
+def expand_recordings(paths: Iterable[Path]) -> List[Path]:
+    """Arquivos informados mais as gravações ``backtest_*`` dos diretórios."""
+    expanded: List[Path] = []
+    for path in paths:
+        if path.is_dir():
+            expanded.extend(
+                candidate
+                for candidate in sorted(path.glob("backtest_*"))
+                if ".tmp" not in candidate.suffixes
+            )
+        else:
+            expanded.append(path)
+    return expanded
+
+
+def merge_recordings(
+    paths: Iterable[Path], report: MergeReport | None = None
+) -> Iterator[Dict[str, Any]]:
+    """Uma linha do tempo única a partir de várias gravações, por timestamp.
+
+    Faz um merge k-way (``heapq.merge``) mantendo só a rodada atual de cada
+    arquivo em memória; cada gravação já está em ordem cronológica. Rodadas
+    com o mesmo ``(timestamp, number, color)`` saem uma única vez e as sem
+    timestamp são ignoradas. Uma rodada mais antiga que a última emitida
+    (arquivo fora de ordem) é descartada e contada em ``out_of_order``.
+    Lacunas maiores que 1,5x a cadência de 30s são registradas em
+    ``report.gaps`` à medida que o stream é consumido.
+    """
+    report = report if report is not None else MergeReport()
+    sources = [_timed(path, report) for path in expand_recordings(paths)]
+    report.files = len(sources)
+    previous: int | None = None
+    seen_at_previous: set[tuple[Any, Any]] = set()
+    for timestamp, result in heapq.merge(*sources, key=_first):
+        identity = (result.get("number"), result.get("color"))
+        if previous is not None:
+            if timestamp < previous:
+                report.out_of_order += 1
+                continue
+            if timestamp == previous:
+                if identity in seen_at_previous:
+                    report.duplicates += 1
+                    continue
+            else:
+                if timestamp - previous >= GAP_THRESHOLD_MS:
+                    missing = round((timestamp - previous) / ROLL_INTERVAL_MS) - 1
+                    report.gaps.append(Gap(previous, timestamp, missing))
+                seen_at_previous.clear()
+        if report.first_timestamp is None:
+            report.first_timestamp = timestamp
+        previous = timestamp
+        report.last_timestamp = timestamp
+        seen_at_previous.add(identity)
+        report.written += 1
+        yield result
+    if report.out_of_order:
+        logger.warning(
+            "%d rodada(s) fora de ordem descartada(s) no merge.", report.out_of_order
+        )
+
+
+def write_merged(paths: Iterable[Path], target: Path) -> MergeReport:
+    """Grava o merge em ``target`` (JSONL, .gz/.xz ou .rolls) via temporário."""
+    report = MergeReport()
+    # O temporário mantém a extensão final para usar o mesmo formato do destino.
+    temporary = target.with_name(f"{target.stem}.tmp{target.suffix}")
+    temporary.unlink(missing_ok=True)
+    merged = merge_recordings(paths, report)
+    if is_roll_file(target):
+        with RollWriter(temporary) as writer:
+            writer.extend(merged)
+    else:
+        with open_recording(temporary, "wt") as handle:
+            for result in merged:
+                handle.write(json.dumps(result, ensure_ascii=False) + "\n")
+    temporary.replace(target)
+    return report
+
+
+def write_gap_report(report: MergeReport, path: Path) -> None:
+    with path.open("w", encoding="utf-8", newline="") as handle:
+        writer = csv.DictWriter(handle, fieldnames=["start", "end", "seconds", "missing"])
+        writer.writeheader()
+        for gap in report.gaps:
+            writer.writerow(gap.to_row())
+
+
+def _timed(path: Path, report: MergeReport) -> Iterator[tuple[int, Dict[str, Any]]]:
+    for result in iter_history(path):
+        report.read += 1
+        timestamp = to_epoch_ms(result.get("timestamp"))
+        if timestamp == UNKNOWN_TIMESTAMP:
+            report.skipped += 1
+            continue
+        yield timestamp, result
+
+
+def _first(item: tuple[int, Dict[str, Any]]) -> int:
+    return item[0]
@@ -0,0 +1,319 @@
+from __future__ import annotations
+
+import gzip
+import json
+import logging
+import lzma
+import os
+import shutil
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import IO, Any, Deque, Dict, List
+
+logger = logging.getLogger(__name__)
+
+COMPRESSION_NONE = "none"
+COMPRESSION_GZIP = "gz"
+COMPRESSION_XZ = "xz"
+
+_COMPRESSORS = {
+    COMPRESSION_GZIP: gzip.open,
+    COMPRESSION_XZ: lzma.open,
+}
+
+INDEX_NAME = "index.jsonl"
+
+
+@dataclass
+class SegmentInfo:
+    """Entrada do índice: um segmento fechado da gravação."""
+
+    segment: str
+    rolls: int = 0
+    first_timestamp: Any = None
+    last_timestamp: Any = None
+    bytes: int = 0
+    compressed_bytes: int | None = None
+
+    def to_json(self) -> Dict[str, Any]:
+        return {
+            "segment": self.segment,
+            "rolls": self.rolls,
+            "first_timestamp": self.first_timestamp,
+            "last_timestamp": self.last_timestamp,
+            "bytes": self.bytes,
+            "compressed_bytes": self.compressed_bytes,
+        }
+
+
+@dataclass
+class RecorderMetrics:
+    rolls: int = 0
+    commits: int = 0
+    segments: int = 0
+    bytes_written: int = 0
+    compressed_bytes: int = 0
+    errors: int = 0
+    max_batch: int = 0
+
+
+class SessionRecorder:
+    """Grava as rodadas da sessão em segmentos JSONL a partir de uma thread.
+
+    ``record`` só enfileira o resultado; serialização, escrita, ``flush`` e
+    ``fsync`` acontecem na thread. As escritas são agrupadas (group commit):
+    o arquivo recebe ``flush`` quando ``commit_every`` rodadas se acumulam ou
+    quando a mais antiga ainda não confirmada passa de ``commit_interval``
+    segundos, e ``fsync`` logo depois se ``fsync`` estiver ativo.
+
+    O segmento atual é fechado ao passar de ``rotate_bytes`` ou
+    ``rotate_seconds`` (``None`` desativa cada limite), comprimido em .gz ou
+    .xz e registrado em ``index.jsonl`` no mesmo diretório com a primeira e a
+    última timestamp e a quantidade de rodadas. O segmento aberto continua em
+    JSONL puro, legível mesmo se o processo morrer no meio.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        prefix: str,
+        *,
+        commit_every: int = 10,
+        commit_interval: float = 1.0,
+        fsync: bool = True,
+        rotate_bytes: int | None = 32 * 1024 * 1024,
+        rotate_seconds: float | None = 24 * 3600,
+        compression: str = COMPRESSION_XZ,
+    ) -> None:
+        if compression != COMPRESSION_NONE and compression not in _COMPRESSORS:
+            raise ValueError(f"Compressão desconhecida: {compression}")
+        self.directory = directory
+        self.prefix = prefix
+        self.commit_every = max(1, commit_every)
+        self.commit_interval = max(0.0, commit_interval)
+        self.fsync = fsync
+        self.rotate_bytes = rotate_bytes if rotate_bytes and rotate_bytes > 0 else None
+        self.rotate_seconds = rotate_seconds if rotate_seconds and rotate_seconds > 0 else None
+        self.compression = compression
+        self.metrics = RecorderMetrics()
+        self.segments: List[Path] = []
+        self._session = datetime.now().strftime("%Y%m%d_%H%M%S")
+        self._pending: Deque[Dict[str, Any]] = deque()
+        self._closing = False
+        self._condition = threading.Condition()
+        self._handle: IO[str] | None = None
+        self._current: SegmentInfo | None = None
+        self._current_path: Path | None = None
+        self._current_started = 0.0
+        self._uncommitted = 0
+        self._uncommitted_since: float | None = None
+        directory.mkdir(parents=True, exist_ok=True)
+        self._worker = threading.Thread(target=self._run, name=f"recorder-{prefix}", daemon=True)
+        self._worker.start()
+
+    @property
+    def path(self) -> Path:
+        """Caminho do primeiro segmento da sessão (o que o usuário vê no início)."""
+        return self.directory / self._segment_name(1)
+
+    def record(self, result: Dict[str, Any]) -> None:
+        with self._condition:
+            if self._closing:
+                logger.warning("Gravador %s já encerrado; rodada ignorada.", self.prefix)
+                return
+            self._pending.append(result)
+            self._condition.notify()
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "rolls": self.metrics.rolls,
+            "commits": self.metrics.commits,
+            "segments": self.metrics.segments,
+            "bytes_written": self.metrics.bytes_written,
+            "compressed_bytes": self.metrics.compressed_bytes,
+            "errors": self.metrics.errors,
+            "max_batch": self.metrics.max_batch,
+            "queue_depth": len(self._pending),
+        }
+
+    def close(self, timeout: float | None = 30.0) -> None:
+        """Grava o que estiver na fila, fecha e comprime o último segmento."""
+        with self._condition:
+            self._closing = True
+            self._condition.notify()
+        self._worker.join(timeout)
+        if self._worker.is_alive():
+            logger.warning("Gravador %s não terminou em %.1fs.", self.prefix, timeout or 0.0)
+
+    def _segment_name(self, number: int) -> str:
+        return f"{self.prefix}_{self._session}_{number:04d}.jsonl"
+
+    def _next_batch(self) -> List[Dict[str, Any]] | None:
+        with self._condition:
+            while not self._pending and not self._closing:
+                timeout = self._idle_timeout()
+                if timeout is not None and timeout <= 0:
+                    return []
+                self._condition.wait(timeout)
+            if not self._pending:
+                return None
+            batch = list(self._pending)
+            self._pending.clear()
+            return batch
+
+    def _idle_timeout(self) -> float | None:
+        """Quanto esperar por novas rodadas antes de um commit ou rotação por tempo."""
+        now = time.monotonic()
+        deadlines = []
+        if self._uncommitted_since is not None:
+            deadlines.append(self._uncommitted_since + self.commit_interval)
+        if self._current is not None and self.rotate_seconds is not None:
+            deadlines.append(self._current_started + self.rotate_seconds)
+        if not deadlines:
+            return None
+        return min(deadlines) - now
+
+    def _run(self) -> None:
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                break
+            try:
+                self.metrics.max_batch = max(self.metrics.max_batch, len(batch))
+                for result in batch:
+                    self._write(result)
+                self._maybe_commit()
+                self._maybe_rotate()
+            except Exception:  # noqa: BLE001 - a thread não pode morrer
+                self.metrics.errors += 1
+                logger.exception("Falha ao gravar rodadas em %s.", self._current_path)
+        try:
+            self._close_segment()
+        except Exception:  # noqa: BLE001
+            self.metrics.errors += 1
+            logger.exception("Falha ao fechar o segmento %s.", self._current_path)
+
+    def _write(self, result: Dict[str, Any]) -> None:
+        if self._handle is None:
+            self._open_segment()
+        assert self._handle is not None and self._current is not None
+        line = json.dumps(result, ensure_ascii=False) + "\n"
+        self._handle.write(line)
+        size = len(line.encode("utf-8"))
+        timestamp = result.get("timestamp")
+        if self._current.first_timestamp is None:
+            self._current.first_timestamp = timestamp
+        self._current.last_timestamp = timestamp
+        self._current.rolls += 1
+        self._current.bytes += size
+        self.metrics.rolls += 1
+        self.metrics.bytes_written += size
+        self._uncommitted += 1
+        if self._uncommitted_since is None:
+            self._uncommitted_since = time.monotonic()
+        if self._uncommitted >= self.commit_every:
+            self._commit()
+        self._maybe_rotate()
+
+    def _maybe_commit(self) -> None:
+        if (
+            self._uncommitted_since is not None
+            and time.monotonic() - self._uncommitted_since >= self.commit_interval
+        ):
+            self._commit()
+
+    def _commit(self) -> None:
+        if self._handle is None or not self._uncommitted:
+            return
+        self._handle.flush()
+        if self.fsync:
+            os.fsync(self._handle.fileno())
+        self.metrics.commits += 1
+        self._uncommitted = 0
+        self._uncommitted_since = None
+
+    def _maybe_rotate(self) -> None:
+        if self._current is None:
+            return
+        too_big = self.rotate_bytes is not None and self._current.bytes >= self.rotate_bytes
+        too_old = (
+            self.rotate_seconds is not None
+            and time.monotonic() - self._current_started >= self.rotate_seconds
+        )
+        if too_big or too_old:
+            self._close_segment()
+
+    def _open_segment(self) -> None:
+        number = len(self.segments) + 1
+        path = self.directory / self._segment_name(number)
+        self._handle = path.open("a", encoding="utf-8")
+        self._current_path = path
+        self._current = SegmentInfo(segment=path.name)
+        self._current_started = time.monotonic()
+        self.segments.append(path)
+        self.metrics.segments += 1
+
+    def _close_segment(self) -> None:
+        if self._handle is None or self._current is None or self._current_path is None:
+            return
+        self._commit()
+        self._handle.close()
+        self._handle = None
+        info = self._current
+        path = self._current_path
+        self._current = None
+        self._current_path = None
+        if self.compression != COMPRESSION_NONE and info.rolls:
+            path = self._compress(path)
+            info.segment = path.name
+            info.compressed_bytes = path.stat().st_size
+            self.metrics.compressed_bytes += info.compressed_bytes
+            self.segments[-1] = path
+        self._append_index(info)
+        logger.info(
+            "Segmento %s fechado: %d rodada(s), %d bytes%s.",
+            path.name,
+            info.rolls,
+            info.bytes,
+            f" ({info.compressed_bytes} comprimido)" if info.compressed_bytes is not None else "",
+        )
+
+    def _compress(self, path: Path) -> Path:
+        """Comprime em um temporário e troca de forma atômica antes de apagar o JSONL."""
+        target = path.with_name(f"{path.name}.{self.compression}")
+        temporary = target.with_name(f"{target.name}.tmp")
+        opener = _COMPRESSORS[self.compression]
+        with path.open("rb") as source, opener(temporary, "wb") as destination:
+            shutil.copyfileobj(source, destination)
+        if self.fsync:
+            with temporary.open("rb") as handle:
+                os.fsync(handle.fileno())
+        os.replace(temporary, target)
+        path.unlink()
+        return target
+
+    def _append_index(self, info: SegmentInfo) -> None:
+        with (self.directory / INDEX_NAME).open("a", encoding="utf-8") as handle:
+            handle.write(json.dumps(info.to_json(), ensure_ascii=False) + "\n")
+            handle.flush()
+            if self.fsync:
+                os.fsync(handle.fileno())
+
+
+def read_index(directory: Path) -> List[Dict[str, Any]]:
+    """Entradas de ``index.jsonl``, ignorando linhas truncadas."""
+    path = directory / INDEX_NAME
+    if not path.exists():
+        return []
+    entries: List[Dict[str, Any]] = []
+    with path.open(encoding="utf-8") as handle:
+        for line in handle:
+            try:
+                entries.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+    return entries
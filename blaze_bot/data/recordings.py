@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+import gzip
+import json
+import lzma
+from pathlib import Path
+from typing import IO, Any, Dict, Iterator
+
+from blaze_bot.data.rollfile import is_roll_file, iter_roll_file
+
+_OPENERS = {
+    ".gz": gzip.open,
+    ".xz": lzma.open,
+}
+
+
+def open_recording(path: Path, mode: str = "rt") -> IO[Any]:
+    """Abre um arquivo de histórico, descomprimindo .gz/.xz de forma transparente."""
+    opener = _OPENERS.get(path.suffix.lower())
+    if opener is None:
+        return path.open(mode, encoding="utf-8")
+    if "b" in mode:
+        return opener(path, mode)
+    return opener(path, mode, encoding="utf-8")
+
+
+def iter_history(path: Path) -> Iterator[Dict[str, Any]]:
+    """Lê o histórico sob demanda, sem carregar o arquivo inteiro em memória.
+
+    JSONL é processado linha a linha. O formato legado em lista JSON ainda é
+    aceito, mas precisa ser decodificado de uma vez. Arquivos ``.rolls``
+    (formato binário) são lidos via ``mmap``.
+    """
+    if is_roll_file(path):
+        yield from iter_roll_file(path)
+        return
+    with open_recording(path) as handle:
+        for line in handle:
+            stripped = line.strip()
+            if not stripped:
+                continue
+            if stripped.startswith("["):
+                yield from json.loads(line + handle.read())
+                return
+            yield json.loads(stripped)
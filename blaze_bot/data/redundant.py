@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, AsyncGenerator, Dict, List, Sequence
+
+from blaze_bot.data.dedup import RecentSignatures, result_signature
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PathMetrics:
+    """Chegadas de uma conexão comparadas com a primeira cópia de cada rodada."""
+
+    first: int = 0
+    late: int = 0
+    avg_delay: float | None = None
+    max_delay: float = 0.0
+
+    def register_late(self, delay: float) -> None:
+        self.late += 1
+        self.max_delay = max(self.max_delay, delay)
+        if self.avg_delay is None:
+            self.avg_delay = delay
+        else:
+            self.avg_delay = (self.avg_delay * 0.9) + (delay * 0.1)
+
+
+class RedundantSocket:
+    """Várias conexões inscritas na mesma sala, entregando cada rodada uma vez.
+
+    Cada socket roda em uma task própria; a primeira cópia de uma rodada
+    (mesma assinatura número/cor/timestamp) é entregue e as demais só
+    alimentam as métricas de atraso por conexão. Se uma conexão cai, as
+    outras continuam entregando enquanto ela reconecta.
+    """
+
+    def __init__(
+        self, sockets: Sequence[Any], *, dedup: RecentSignatures | None = None
+    ) -> None:
+        if not sockets:
+            raise ValueError("RedundantSocket precisa de ao menos um socket.")
+        self.sockets = list(sockets)
+        self.dedup = dedup if dedup is not None else RecentSignatures()
+        self.paths: List[PathMetrics] = [PathMetrics() for _ in self.sockets]
+
+    async def listen(self) -> AsyncGenerator[Dict[str, Any], None]:
+        arrivals: asyncio.Queue[tuple[int, float, Dict[str, Any]]] = asyncio.Queue()
+        tasks = [
+            asyncio.create_task(self._pump(index, socket, arrivals))
+            for index, socket in enumerate(self.sockets)
+        ]
+        try:
+            while True:
+                index, arrived_at, result = await arrivals.get()
+                if self._register(index, arrived_at, result):
+                    yield result
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            **self.dedup.snapshot(),
+            "paths": [
+                {
+                    "first": path.first,
+                    "late": path.late,
+                    "avg_delay": path.avg_delay,
+                    "max_delay": path.max_delay,
+                    **(socket.metrics() if hasattr(socket, "metrics") else {}),
+                }
+                for path, socket in zip(self.paths, self.sockets)
+            ],
+        }
+
+    def close(self) -> None:
+        for socket in self.sockets:
+            if hasattr(socket, "close"):
+                socket.close()
+
+    def _register(self, index: int, arrived_at: float, result: Dict[str, Any]) -> bool:
+        signature = result_signature(result)
+        if self.dedup.add(signature, (index, arrived_at)):
+            self.paths[index].first += 1
+            return True
+        first_index, first_at = self.dedup.get(signature)
+        if first_index != index:
+            self.paths[index].register_late(arrived_at - first_at)
+        return False
+
+    @staticmethod
+    async def _pump(
+        index: int,
+        socket: Any,
+        arrivals: asyncio.Queue[tuple[int, float, Dict[str, Any]]],
+    ) -> None:
+        async for result in socket.listen():
+            arrivals.put_nowait((index, time.monotonic(), result))
+        logger.warning("Conexão redundante %d terminou.", index)
@@ -0,0 +1,221 @@
+from __future__ import annotations
+
+import mmap
+import struct
+from array import array
+from functools import lru_cache
+from pathlib import Path
+from typing import IO, Any, Dict, Iterable, Iterator
+
+from blaze_bot.core.history import (
+    COLOR_CODES,
+    COLOR_NAMES,
+    UNKNOWN_COLOR,
+    UNKNOWN_NUMBER,
+    UNKNOWN_TIMESTAMP,
+    RollHistory,
+    _to_number,
+    from_epoch_ms,
+    to_epoch_ms,
+)
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - dependência opcional
+    np = None
+
+ROLLS_SUFFIX = ".rolls"
+MAGIC = b"BLZROLLS"
+VERSION = 1
+
+# Cabeçalho: magic, versão, tamanho do registro e 4 bytes reservados.
+HEADER = struct.Struct("<8sHH4x")
+# Registro: cor int8, número int8, timestamp int64 (epoch em ms), sem padding.
+RECORD = struct.Struct("<bbq")
+
+RECORD_DTYPE = (
+    np.dtype([("color", "i1"), ("number", "i1"), ("timestamp", "<i8")]) if np is not None else None
+)
+
+
+class RollFileError(ValueError):
+    """Arquivo que não está no formato binário de rodadas (ou em versão desconhecida)."""
+
+
+class RollWriter:
+    """Grava rodadas no formato binário de largura fixa.
+
+    Arquivos existentes recebem os novos registros no final, depois de
+    conferir o cabeçalho. Cores, números e timestamps seguem as mesmas
+    convenções do ``RollHistory`` (``-1`` para valores desconhecidos).
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.rolls = 0
+        exists = path.exists() and path.stat().st_size > 0
+        self._handle: IO[bytes] = path.open("ab")
+        if exists:
+            with path.open("rb") as handle:
+                _check_header(handle.read(HEADER.size), path)
+        else:
+            self._handle.write(HEADER.pack(MAGIC, VERSION, RECORD.size))
+
+    def append(self, result: Dict[str, Any]) -> None:
+        self._handle.write(
+            RECORD.pack(
+                COLOR_CODES.get(result.get("color"), UNKNOWN_COLOR),
+                _to_number(result.get("number")),
+                to_epoch_ms(result.get("timestamp")),
+            )
+        )
+        self.rolls += 1
+
+    def extend(self, results: Iterable[Dict[str, Any]]) -> None:
+        for result in results:
+            self.append(result)
+
+    def close(self) -> None:
+        if not self._handle.closed:
+            self._handle.close()
+
+    def __enter__(self) -> "RollWriter":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+class RollFile:
+    """Leitura de um arquivo ``.rolls`` via ``mmap``, sem decodificar linha a linha.
+
+    ``records``/``colors``/``numbers``/``timestamps`` são views NumPy sobre o
+    próprio mapeamento (zero-copy) e iterar devolve dicts no formato do
+    JSONL, para estratégias que esperam o histórico legado. Um registro
+    incompleto no final (gravação interrompida) é ignorado.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        with path.open("rb") as handle:
+            _check_header(handle.read(HEADER.size), path)
+            self._map = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        self._count = (len(self._map) - HEADER.size) // RECORD.size
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        view = memoryview(self._map)[HEADER.size : HEADER.size + self._count * RECORD.size]
+        try:
+            for color, number, timestamp in RECORD.iter_unpack(view):
+                yield {
+                    "timestamp": _format_timestamp(timestamp),
+                    "number": None if number == UNKNOWN_NUMBER else number,
+                    "color": COLOR_NAMES.get(color),
+                }
+        finally:
+            view.release()
+
+    def records(self) -> Any:
+        _require_numpy()
+        return np.frombuffer(self._map, dtype=RECORD_DTYPE, count=self._count, offset=HEADER.size)
+
+    def colors(self) -> Any:
+        return self.records()["color"]
+
+    def numbers(self) -> Any:
+        return self.records()["number"]
+
+    def timestamps(self) -> Any:
+        return self.records()["timestamp"]
+
+    def to_history(self, *, maxlen: int | None = None) -> RollHistory:
+        """Copia as colunas para um ``RollHistory`` (o arquivo pode ser fechado depois)."""
+        if np is None:
+            return RollHistory(self, maxlen=maxlen)
+        records = self.records()
+        if maxlen is not None:
+            records = records[-maxlen:]
+        return RollHistory.from_columns(
+            array("b", np.ascontiguousarray(records["color"]).tobytes()),
+            array("b", np.ascontiguousarray(records["number"]).tobytes()),
+            array("q", np.ascontiguousarray(records["timestamp"]).tobytes()),
+            total=self._count,
+            maxlen=maxlen,
+        )
+
+    def close(self) -> None:
+        try:
+            self._map.close()
+        except BufferError:
+            # Ainda há views NumPy apontando para o mapeamento; ele é liberado
+            # junto com a última delas.
+            pass
+
+    def __enter__(self) -> "RollFile":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+def is_roll_file(path: Path) -> bool:
+    return path.suffix.lower() == ROLLS_SUFFIX
+
+
+def iter_roll_file(path: Path) -> Iterator[Dict[str, Any]]:
+    roll_file = RollFile(path)
+    try:
+        yield from roll_file
+    finally:
+        roll_file.close()
+
+
+def convert_to_rolls(results: Iterable[Dict[str, Any]], target: Path) -> int:
+    """Grava ``results`` (ex.: ``iter_history`` de um JSONL) em ``target``.
+
+    O arquivo é montado em um temporário e só substitui o destino no final,
+    então uma conversão interrompida não deixa um ``.rolls`` pela metade.
+    """
+    temporary = target.with_name(f"{target.name}.tmp")
+    temporary.unlink(missing_ok=True)
+    with RollWriter(temporary) as writer:
+        writer.extend(results)
+    temporary.replace(target)
+    return writer.rolls
+
+
+def _format_timestamp(value: int) -> str | None:
+    """Mesmo texto de ``from_epoch_ms``, montado a partir da data em cache."""
+    if value == UNKNOWN_TIMESTAMP:
+        return None
+    day, remainder = divmod(value, 86_400_000)
+    seconds, millis = divmod(remainder, 1000)
+    minutes, seconds = divmod(seconds, 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{_day_prefix(day)}T{hours:02d}:{minutes:02d}:{seconds:02d}.{millis:03d}Z"
+
+
+@lru_cache(maxsize=1024)
+def _day_prefix(day: int) -> str:
+    return from_epoch_ms(day * 86_400_000)[:10]
+
+
+def _check_header(raw: bytes, path: Path) -> None:
+    if len(raw) < HEADER.size:
+        raise RollFileError(f"{path}: cabeçalho incompleto.")
+    magic, version, record_size = HEADER.unpack(raw)
+    if magic != MAGIC:
+        raise RollFileError(f"{path}: não é um arquivo de rodadas.")
+    if version != VERSION or record_size != RECORD.size:
+        raise RollFileError(
+            f"{path}: versão {version} (registro de {record_size} bytes) não suportada."
+        )
+
+
+def _require_numpy() -> None:
+    if np is None:
+        raise ImportError(
+            "NumPy é necessário para as views do arquivo de rodadas (pip install numpy)."
+        )
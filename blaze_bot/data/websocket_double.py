@@ -3,13 +3,24 @@ from __future__ import annotations
 import asyncio
 import json
 import logging
+import re
+import time
 from datetime import datetime
-from typing import Any, AsyncGenerator, Dict
+from typing import TYPE_CHECKING, Any, AsyncGenerator, Dict
 
 import websockets
 
+from blaze_bot.data.dedup import RecentSignatures
+
+if TYPE_CHECKING:
+    from blaze_bot.data.capture import FrameCapture
+
 logger = logging.getLogger(__name__)
 
+_RESULT_KEYS = ('"roll"', '"number"')
+_STATUS = re.compile(r'"status"\s*:\s*"([^"]*)"')
+_COLOR_NAMES = {0: "white", 1: "red", 2: "black"}
+
 
 class BlazeDoubleWebSocket:
     def __init__(
@@ -21,15 +32,30 @@ class BlazeDoubleWebSocket:
         namespace: str = "",
         reconnect_backoff_initial: float = 1.0,
         reconnect_backoff_max: float = 10.0,
+        handshake_timeout: float = 20.0,
+        dedup: RecentSignatures | None = None,
+        capture: FrameCapture | None = None,
     ) -> None:
         self.url = url
         self.token = token
         self.room = room
         self._last_status: str | None = None
-        self._last_result_signature: tuple[Any, ...] | None = None
+        self.dedup = dedup if dedup is not None else RecentSignatures()
+        self.capture = capture
         self._namespace = namespace
         self._reconnect_backoff_initial = reconnect_backoff_initial
         self._reconnect_backoff_max = reconnect_backoff_max
+        self._handshake_timeout = handshake_timeout
+        # Engine.IO v3: o cliente envia os pings; v4: o servidor envia.
+        self._client_pings = "EIO=3" in url
+        self.ping_interval: float | None = None
+        self.ping_timeout: float | None = None
+        self.connects = 0
+        self.stalls = 0
+        self.last_reconnect_time: float | None = None
+        self._last_frame_at: float | None = None
+        self._last_ping_at: float | None = None
+        self._disconnected_at: float | None = None
 
     async def listen(self) -> AsyncGenerator[Dict[str, Any], None]:
         backoff = self._reconnect_backoff_initial
@@ -40,14 +66,25 @@ class BlazeDoubleWebSocket:
                     logger.info("Conexão WebSocket estabelecida com sucesso.")
                     await self._send_connect(socket)
                     backoff = self._reconnect_backoff_initial
-                    async for message in socket:
-                        if await self._handle_control_message(socket, message):
-                            continue
-                        parsed = self._parse_message(message)
-                        if parsed:
-                            yield parsed
+                    heartbeat = asyncio.create_task(self._send_pings(socket))
+                    try:
+                        while True:
+                            message = await self._receive(socket)
+                            if message is None:
+                                break
+                            if not message.startswith("42") and await self._handle_control_message(
+                                socket, message
+                            ):
+                                continue
+                            parsed = self._parse_message(message)
+                            if parsed:
+                                yield parsed
+                    finally:
+                        heartbeat.cancel()
+                        self._mark_disconnected()
                     logger.warning("Conexão WebSocket encerrada.")
             except (OSError, websockets.WebSocketException) as exc:
+                self._mark_disconnected()
                 logger.warning(
                     "Falha ao conectar/manter o WebSocket. Nova tentativa em %ss. Motivo: %s",
                     backoff,
@@ -56,6 +93,64 @@ class BlazeDoubleWebSocket:
                 await asyncio.sleep(backoff)
                 backoff = min(backoff * 2, self._reconnect_backoff_max)
 
+    def metrics(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        return {
+            "connects": self.connects,
+            "stalls": self.stalls,
+            "last_reconnect_time": self.last_reconnect_time,
+            "last_ping_age": now - self._last_ping_at if self._last_ping_at else None,
+            "last_frame_age": now - self._last_frame_at if self._last_frame_at else None,
+            "ping_interval": self.ping_interval,
+            "ping_timeout": self.ping_timeout,
+            **self.dedup.snapshot(),
+        }
+
+    def close(self) -> None:
+        if self.capture is not None:
+            self.capture.close()
+
+    def heartbeat_deadline(self) -> float:
+        """Silêncio máximo tolerado: pingInterval + pingTimeout, ou o prazo do handshake."""
+        if self.ping_interval is None or self.ping_timeout is None:
+            return self._handshake_timeout
+        return self.ping_interval + self.ping_timeout
+
+    async def _receive(self, socket: websockets.WebSocketClientProtocol) -> str | None:
+        """Próximo frame; None se o servidor fechou ou se o prazo do heartbeat estourou."""
+        try:
+            message = await asyncio.wait_for(socket.recv(), timeout=self.heartbeat_deadline())
+        except asyncio.TimeoutError:
+            self.stalls += 1
+            logger.warning(
+                "Nenhum frame em %.1fs; conexão considerada morta, reconectando.",
+                self.heartbeat_deadline(),
+            )
+            return None
+        except websockets.ConnectionClosedOK:
+            return None
+        self._last_frame_at = time.monotonic()
+        if self.capture is not None:
+            self.capture.write(message)
+        return message
+
+    async def _send_pings(self, socket: websockets.WebSocketClientProtocol) -> None:
+        if not self._client_pings:
+            return
+        try:
+            while True:
+                await asyncio.sleep(self.ping_interval or self._handshake_timeout)
+                if self.ping_interval is not None:
+                    await socket.send("2")
+        except websockets.ConnectionClosed:
+            return
+
+    def _mark_disconnected(self) -> None:
+        if self._disconnected_at is None:
+            self._disconnected_at = time.monotonic()
+        self.ping_interval = None
+        self.ping_timeout = None
+
     async def _send_connect(self, socket: websockets.WebSocketClientProtocol) -> None:
         """Envia o comando de conexão do Socket.IO (Engine.IO v3)."""
         if self._namespace:
@@ -78,14 +173,27 @@ class BlazeDoubleWebSocket:
                 ping_interval,
                 ping_timeout,
             )
+            if ping_interval is not None and ping_timeout is not None:
+                self.ping_interval = float(ping_interval) / 1000
+                self.ping_timeout = float(ping_timeout) / 1000
+            self.connects += 1
+            self._last_ping_at = time.monotonic()
+            if self._disconnected_at is not None:
+                self.last_reconnect_time = self._last_ping_at - self._disconnected_at
+                logger.info("Reconectado em %.2fs.", self.last_reconnect_time)
+                self._disconnected_at = None
             await self._send_connect(socket)
             await self._send_initial_messages(socket)
             return True
         if message == "2":
             logger.debug("Ping Engine.IO recebido, enviando pong.")
+            self._last_ping_at = time.monotonic()
             await socket.send("3")
             return True
-        if message in {"3", "40", f"40{self._namespace}"}:
+        if message == "3":
+            self._last_ping_at = time.monotonic()
+            return True
+        if message in {"40", f"40{self._namespace}"}:
             logger.debug("Mensagem Engine.IO ignorada: %s", message)
             return True
         return False
@@ -109,71 +217,90 @@ class BlazeDoubleWebSocket:
             await socket.send(f"42{message}")
 
     def _parse_message(self, message: str) -> Dict[str, Any] | None:
-        if message.startswith("42"):
-            message = message[2:]
-            if message.startswith("/"):
-                _, _, payload = message.partition(",")
-                message = payload
-        elif message in {"2", "3"}:
-            logger.debug("Ping/Pong do WebSocket recebido: %s", message)
+        if not message.startswith("42"):
+            if message in {"2", "3"}:
+                logger.debug("Ping/Pong do WebSocket recebido: %s", message)
+            elif message:
+                logger.debug("Mensagem WebSocket não processada: %s", message)
             return None
-        elif message:
-            logger.debug("Mensagem WebSocket não processada: %s", message)
+        # Atalho: sem "roll"/"number" com valor não nulo o frame não vira
+        # resultado (ex.: status waiting); só o status é extraído, sem decodificar
+        # o JSON inteiro.
+        if not _has_result_value(message):
+            status_match = _STATUS.search(message)
+            if status_match is not None:
+                self._track_status(status_match.group(1))
             return None
+
+        body = message[2:]
+        if body.startswith("/"):
+            _, _, body = body.partition(",")
         try:
-            payload = json.loads(message)
+            payload = json.loads(body)
         except json.JSONDecodeError:
             return None
 
-        data: Any
-        if isinstance(payload, list) and len(payload) >= 2 and payload[0] == "data":
-            data = payload[1]
+        if type(payload) is list:
+            data = payload[1] if len(payload) >= 2 and payload[0] == "data" else None
+            payload = None
+        elif type(payload) is dict:
+            data = payload.get("data")
         else:
-            data = payload.get("data") if isinstance(payload, dict) else None
-
-        if isinstance(data, dict) and isinstance(data.get("payload"), dict):
-            data = data["payload"]
-
-        status = data.get("status") if isinstance(data, dict) else None
-        if isinstance(status, str) and status != self._last_status:
-            logger.info("Status do double: %s", status)
-            if status == "waiting":
-                logger.info("Roleta aguardando próxima rodada (sem número ainda).")
-            self._last_status = status
-        if status == "waiting":
-            self._last_status = "waiting"
             return None
-
-        if isinstance(data, dict):
-            color = data.get("color") if "color" in data else data.get("colour")
-            number = data.get("roll") if "roll" in data else data.get("number")
-            timestamp = data.get("created_at") or data.get("timestamp")
+        if type(data) is dict:
+            inner = data.get("payload")
+            if type(inner) is dict:
+                data = inner
+            status = data.get("status")
+            if type(status) is str:
+                self._track_status(status)
+                if status == "waiting":
+                    return None
+        elif payload is not None:
+            data = payload
         else:
-            if isinstance(payload, dict):
-                color = payload.get("color") if "color" in payload else payload.get("colour")
-                number = payload.get("roll") if "roll" in payload else payload.get("number")
-                timestamp = payload.get("created_at") or payload.get("timestamp")
-            else:
-                color = None
-                number = None
-                timestamp = None
+            return None
 
+        color = data["color"] if "color" in data else data.get("colour")
+        number = data["roll"] if "roll" in data else data.get("number")
         if color is None or number is None:
             return None
-
+        timestamp = data.get("created_at") or data.get("timestamp")
         if timestamp is None:
             timestamp = datetime.utcnow().isoformat()
 
+        number = int(number)
         normalized_color = self._normalize_color(color)
-        signature = (int(number), normalized_color, timestamp)
-        if self._last_result_signature == signature:
+        if not self.dedup.add((number, normalized_color, timestamp)):
             return None
-        self._last_result_signature = signature
+        return {"timestamp": timestamp, "number": number, "color": normalized_color}
 
-        return {"timestamp": timestamp, "number": int(number), "color": normalized_color}
+    def _track_status(self, status: str) -> None:
+        if status == self._last_status:
+            return
+        logger.info("Status do double: %s", status)
+        if status == "waiting":
+            logger.info("Roleta aguardando próxima rodada (sem número ainda).")
+        self._last_status = status
 
-    def _normalize_color(self, color: Any) -> str:
+    @staticmethod
+    def _normalize_color(color: Any) -> str:
         if isinstance(color, str):
             return color
-        mapping = {0: "white", 1: "red", 2: "black"}
-        return mapping.get(int(color), str(color))
+        return _COLOR_NAMES.get(int(color), str(color))
+
+
+def _has_result_value(body: str) -> bool:
+    """False só quando todo "roll"/"number" do frame é exatamente ``:null``.
+
+    Qualquer outra forma (valor, espaços, a palavra como string) cai no
+    parse completo, então o atalho nunca descarta um resultado.
+    """
+    for key in _RESULT_KEYS:
+        start = body.find(key)
+        while start != -1:
+            value_at = start + len(key)
+            if not body.startswith(":null", value_at):
+                return True
+            start = body.find(key, value_at)
+    return False
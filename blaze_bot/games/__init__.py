@@ -4,6 +4,8 @@ from dataclasses import dataclass
 from typing import Any, Callable, Dict
 
 from blaze_bot.config.settings import Settings
+from blaze_bot.data.capture import FrameCapture
+from blaze_bot.data.redundant import RedundantSocket
 from blaze_bot.data.websocket_double import BlazeDoubleWebSocket
 
 
@@ -15,14 +17,26 @@ class GameConfig:
     socket_builder: Callable[[Settings], Any]
 
 
-def _build_double_socket(settings: Settings) -> BlazeDoubleWebSocket:
-    return BlazeDoubleWebSocket(
-        settings.websocket_url,
-        token=settings.websocket_token,
-        room=settings.websocket_room,
-        reconnect_backoff_initial=settings.websocket_reconnect_backoff_initial,
-        reconnect_backoff_max=settings.websocket_reconnect_backoff_max,
-    )
+def _build_double_socket(settings: Settings) -> BlazeDoubleWebSocket | RedundantSocket:
+    sockets = [
+        BlazeDoubleWebSocket(
+            settings.websocket_url,
+            token=settings.websocket_token,
+            room=settings.websocket_room,
+            reconnect_backoff_initial=settings.websocket_reconnect_backoff_initial,
+            reconnect_backoff_max=settings.websocket_reconnect_backoff_max,
+            # Só a conexão principal grava frames, para a captura não ter cópias.
+            capture=(
+                FrameCapture(settings.websocket_capture_path)
+                if index == 0 and settings.websocket_capture_path is not None
+                else None
+            ),
+        )
+        for index in range(settings.websocket_connections)
+    ]
+    if len(sockets) == 1:
+        return sockets[0]
+    return RedundantSocket(sockets)
 
 
 def available_games() -> Dict[str, GameConfig]:
@@ -1,12 +1,13 @@
 from __future__ import annotations
 
-from collections import Counter
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Optional
 
-from blaze_bot.strategies.base import StrategyBase
+from blaze_bot.core import vectorized
+from blaze_bot.core.rolling import ColorWindow
+from blaze_bot.strategies.base import IncrementalStrategy
 
 
-class Strategy(StrategyBase):
+class Strategy(IncrementalStrategy):
     """Aposta na cor menos frequente em uma janela curta."""
 
     MARTINGALE = 1
@@ -14,29 +15,31 @@ class Strategy(StrategyBase):
     WINDOW = 12
     MIN_DIFF = 4
 
-    def analyze(self, history: List[Dict[str, Any]]) -> Dict[str, Any]:
-        recent = [
-            item.get("color")
-            for item in history[-self.WINDOW :]
-            if item.get("color") in {"red", "black"}
-        ]
-        counts = Counter(recent)
-        red = counts.get("red", 0)
-        black = counts.get("black", 0)
+    def declare_features(self) -> Dict[str, Any]:
+        return {"window": ColorWindow(self.WINDOW)}
+
+    def current_analysis(self) -> Dict[str, Any]:
+        window = self.features["window"]
+        red = window.count("red")
+        black = window.count("black")
         diff = abs(red - black)
         target: Optional[str] = None
-        if len(recent) >= self.WINDOW and diff >= self.MIN_DIFF:
+        if red + black >= self.WINDOW and diff >= self.MIN_DIFF:
             target = "red" if red < black else "black"
         return {
-            "counts": dict(counts),
+            "counts": {
+                color: count
+                for color, count in (("red", red), ("black", black))
+                if count
+            },
             "diff": diff,
             "target": target,
         }
 
-    def predict(self, history: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
-        if len(history) < self.WINDOW:
+    def predict_next(self) -> Optional[Dict[str, Any]]:
+        if self.rolls_seen < self.WINDOW:
             return None
-        analysis = self.analyze(history)
+        analysis = self.current_analysis()
         target = analysis["target"]
         if target is None:
             return None
@@ -47,5 +50,16 @@ class Strategy(StrategyBase):
         )
         return {"color": target, "reason": reason}
 
+    def signal_kernel(self, colors: Any) -> vectorized.SignalArrays:
+        red = vectorized.rolling_count(colors, vectorized.RED, self.WINDOW)
+        black = vectorized.rolling_count(colors, vectorized.BLACK, self.WINDOW)
+        mask = (
+            vectorized.warmed_up(colors, self.WINDOW)
+            & (red + black >= self.WINDOW)
+            & (abs(red - black) >= self.MIN_DIFF)
+        )
+        target = vectorized.choose(red < black, vectorized.RED, vectorized.BLACK)
+        return vectorized.SignalArrays(mask=mask, color=target)
+
     def validate(self, prediction: Dict[str, Any], result: Dict[str, Any]) -> bool:
         return prediction.get("color") == result.get("color")
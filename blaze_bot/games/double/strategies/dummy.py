@@ -1,18 +1,23 @@
 from __future__ import annotations
 
-from typing import Any, Dict, List
-from blaze_bot.strategies.base import StrategyBase
+from typing import Any, Dict
+from blaze_bot.strategies.base import IncrementalStrategy
 
-class Strategy(StrategyBase):
+class Strategy(IncrementalStrategy):
     """Alterna entre vermelho e preto ignorando o branco."""
 
-    def analyze(self, history: List[Dict[str, Any]]) -> Dict[str, Any]:
-        last_color = history[-1]["color"] if history else "red"
-        next_color = "black" if last_color == "red" else "red"
+    def reset_state(self) -> None:
+        self._last_color = "red"
+
+    def update(self, result: Dict[str, Any]) -> None:
+        self._last_color = result["color"]
+
+    def current_analysis(self) -> Dict[str, Any]:
+        next_color = "black" if self._last_color == "red" else "red"
         return {"next_color": next_color}
 
-    def predict(self, history: List[Dict[str, Any]]) -> Dict[str, Any]:
-        analysis = self.analyze(history)
+    def predict_next(self) -> Dict[str, Any]:
+        analysis = self.current_analysis()
         return {"color": analysis["next_color"]}
 
     def validate(self, prediction: Dict[str, Any], result: Dict[str, Any]) -> bool:
@@ -3,7 +3,7 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import Any, Dict, List, Optional
 
-from blaze_bot.strategies.base import StrategyBase
+from blaze_bot.strategies.base import IncrementalStrategy
 
 
 @dataclass
@@ -16,7 +16,7 @@ class WhiteEvent:
     phase2_done: bool = False
 
 
-class Strategy(StrategyBase):
+class Strategy(IncrementalStrategy):
     """Agenda duas janelas de aposta no branco após cada branco."""
 
     MARTINGALE = 0
@@ -25,24 +25,18 @@ class Strategy(StrategyBase):
     PHASE2_DELAY = 36
     MAX_ATTEMPTS = 10
 
-    def __init__(self) -> None:
+    def reset_state(self) -> None:
         self._events: List[WhiteEvent] = []
-        self._last_history_len = 0
         self._next_event_id = 1
 
-    def analyze(self, history: List[Dict[str, Any]]) -> Dict[str, Any]:
-        if not history:
-            self._last_history_len = 0
-            return {"pending_events": 0}
-
-        new_results = history[self._last_history_len :]
-        for result in new_results:
-            self._advance_events(result)
-        self._last_history_len = len(history)
+    def update(self, result: Dict[str, Any]) -> None:
+        self._advance_events(result)
         self._cleanup_events()
+
+    def current_analysis(self) -> Dict[str, Any]:
         return {"pending_events": len(self._events)}
 
-    def predict(self, history: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    def predict_next(self) -> Optional[Dict[str, Any]]:
         active_events = []
         for event in self._events:
             phase = self._event_phase(event)
@@ -1,11 +1,13 @@
 from __future__ import annotations
 
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Optional, Tuple
 
-from blaze_bot.strategies.base import StrategyBase
+from blaze_bot.core import vectorized
+from blaze_bot.core.rolling import StreakTracker
+from blaze_bot.strategies.base import IncrementalStrategy
 
 
-class Strategy(StrategyBase):
+class Strategy(IncrementalStrategy):
     """Segue sequências curtas de vermelho/preto, ignorando branco."""
 
     MARTINGALE = 1
@@ -13,26 +15,21 @@ class Strategy(StrategyBase):
     MIN_STREAK = 3
     MAX_STREAK = 6
 
-    def _current_streak(self, history: List[Dict[str, Any]]) -> Tuple[Optional[str], int]:
-        if not history:
-            return None, 0
-        last_color = history[-1].get("color")
-        if last_color not in {"red", "black"}:
+    def declare_features(self) -> Dict[str, Any]:
+        return {"streak": StreakTracker()}
+
+    def _current_streak(self) -> Tuple[Optional[str], int]:
+        streak = self.features["streak"]
+        if streak.color not in {"red", "black"}:
             return None, 0
-        length = 0
-        for item in reversed(history):
-            color = item.get("color")
-            if color != last_color:
-                break
-            length += 1
-        return last_color, length
-
-    def analyze(self, history: List[Dict[str, Any]]) -> Dict[str, Any]:
-        color, length = self._current_streak(history)
+        return streak.color, streak.length
+
+    def current_analysis(self) -> Dict[str, Any]:
+        color, length = self._current_streak()
         return {"streak_color": color, "streak_length": length}
 
-    def predict(self, history: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
-        color, length = self._current_streak(history)
+    def predict_next(self) -> Optional[Dict[str, Any]]:
+        color, length = self._current_streak()
         if color is None:
             return None
         if self.MIN_STREAK <= length <= self.MAX_STREAK:
@@ -42,5 +39,14 @@ class Strategy(StrategyBase):
             }
         return None
 
+    def signal_kernel(self, colors: Any) -> vectorized.SignalArrays:
+        lengths = vectorized.streak_lengths(colors)
+        mask = (
+            ((colors == vectorized.RED) | (colors == vectorized.BLACK))
+            & (lengths >= self.MIN_STREAK)
+            & (lengths <= self.MAX_STREAK)
+        )
+        return vectorized.SignalArrays(mask=mask, color=colors)
+
     def validate(self, prediction: Dict[str, Any], result: Dict[str, Any]) -> bool:
         return prediction.get("color") == result.get("color")
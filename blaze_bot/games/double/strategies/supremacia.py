@@ -1,45 +1,37 @@
 from __future__ import annotations
 
-from typing import Any, Dict, List, Optional
-from blaze_bot.strategies.base import StrategyBase
-from collections import Counter
+from typing import Any, Dict, Optional
+from blaze_bot.core.rolling import ColorWindow
+from blaze_bot.strategies.base import IncrementalStrategy
 
-class Strategy(StrategyBase):
+class Strategy(IncrementalStrategy):
     """Gera sinal quando 14+ das últimas 20 cores forem iguais."""
 
     MARTINGALE = 0
 
-    def __init__(self) -> None:
+    def declare_features(self) -> Dict[str, Any]:
+        return {"window": ColorWindow(20)}
+
+    def reset_state(self) -> None:
         self._active_color: Optional[str] = None
         self._loss_streak = 0
-        self._last_history_len = 0
         self._stopped_at_len: Optional[int] = None
 
-    def _update_state(self, history: List[Dict[str, Any]]) -> None:
-        if not history:
-            self._last_history_len = 0
+    def update(self, result: Dict[str, Any]) -> None:
+        if not self._active_color:
+            return
+        color = result.get("color")
+        if color == self._active_color or color == "white":
+            self._loss_streak = 0
             return
-        new_results = history[self._last_history_len :]
-        current_len = self._last_history_len
-        for result in new_results:
-            current_len += 1
-            if not self._active_color:
-                continue
-            color = result.get("color")
-            if color == self._active_color or color == "white":
-                self._loss_streak = 0
-                continue
-            self._loss_streak += 1
-            if self._loss_streak >= 3:
-                self._active_color = None
-                self._loss_streak = 0
-                self._stopped_at_len = current_len
-        self._last_history_len = len(history)
+        self._loss_streak += 1
+        if self._loss_streak >= 3:
+            self._active_color = None
+            self._loss_streak = 0
+            self._stopped_at_len = self.rolls_seen
 
-    def analyze(self, history: List[Dict[str, Any]]) -> Dict[str, Any]:
-        self._update_state(history)
-        colors = [item.get("color") for item in history[-20:] if item.get("color")]
-        counts = Counter(colors)
+    def current_analysis(self) -> Dict[str, Any]:
+        counts = self.features["window"].counts()
         white_count = counts.get("white", 0)
         threshold = 13 if white_count > 0 else 14
         color_counts = {color: counts.get(color, 0) for color in ("red", "black")}
@@ -52,21 +44,21 @@ class Strategy(StrategyBase):
         return {
             "dominant_color": dominant_color,
             "dominant_count": dominant_count,
-            "counts": dict(counts),
+            "counts": counts,
             "threshold": threshold,
         }
 
-    def predict(self, history: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
-        if len(history) < 20:
+    def predict_next(self) -> Optional[Dict[str, Any]]:
+        if self.rolls_seen < 20:
             return None
 
-        analysis = self.analyze(history)
+        analysis = self.current_analysis()
 
         dominant = analysis["dominant_color"]
         threshold = analysis["threshold"]
 
         if self._active_color is None:
-            if dominant is None or self._stopped_at_len == len(history):
+            if dominant is None or self._stopped_at_len == self.rolls_seen:
                 return None
             self._active_color = dominant
             self._loss_streak = 0
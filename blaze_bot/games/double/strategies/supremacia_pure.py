@@ -1,47 +1,40 @@
 from __future__ import annotations
 
-from collections import Counter
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Optional
 
-from blaze_bot.strategies.base import StrategyBase
+from blaze_bot.core import vectorized
+from blaze_bot.core.rolling import ColorWindow
+from blaze_bot.strategies.base import IncrementalStrategy
 
 
-class Strategy(StrategyBase):
+class Strategy(IncrementalStrategy):
     """Gera sinal quando 14+ das últimas 20 cores forem iguais (aposta simples)."""
 
     MARTINGALE = 0
 
-    def __init__(self) -> None:
+    def declare_features(self) -> Dict[str, Any]:
+        return {"window": ColorWindow(20)}
+
+    def reset_state(self) -> None:
         self._active_color: Optional[str] = None
         self._loss_streak = 0
-        self._last_history_len = 0
         self._stopped_at_len: Optional[int] = None
 
-    def _update_state(self, history: List[Dict[str, Any]]) -> None:
-        if not history:
-            self._last_history_len = 0
+    def update(self, result: Dict[str, Any]) -> None:
+        if not self._active_color:
+            return
+        color = result.get("color")
+        if color == self._active_color:
+            self._loss_streak = 0
             return
-        new_results = history[self._last_history_len :]
-        current_len = self._last_history_len
-        for result in new_results:
-            current_len += 1
-            if not self._active_color:
-                continue
-            color = result.get("color")
-            if color == self._active_color:
-                self._loss_streak = 0
-                continue
-            self._loss_streak += 1
-            if self._loss_streak >= 3:
-                self._active_color = None
-                self._loss_streak = 0
-                self._stopped_at_len = current_len
-        self._last_history_len = len(history)
-
-    def analyze(self, history: List[Dict[str, Any]]) -> Dict[str, Any]:
-        self._update_state(history)
-        colors = [item.get("color") for item in history[-20:] if item.get("color")]
-        counts = Counter(colors)
+        self._loss_streak += 1
+        if self._loss_streak >= 3:
+            self._active_color = None
+            self._loss_streak = 0
+            self._stopped_at_len = self.rolls_seen
+
+    def current_analysis(self) -> Dict[str, Any]:
+        counts = self.features["window"].counts()
         white_count = counts.get("white", 0)
         threshold = 13 if white_count > 0 else 14
         color_counts = {color: counts.get(color, 0) for color in ("red", "black")}
@@ -54,21 +47,21 @@ class Strategy(StrategyBase):
         return {
             "dominant_color": dominant_color,
             "dominant_count": dominant_count,
-            "counts": dict(counts),
+            "counts": counts,
             "threshold": threshold,
         }
 
-    def predict(self, history: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
-        if len(history) < 20:
+    def predict_next(self) -> Optional[Dict[str, Any]]:
+        if self.rolls_seen < 20:
             return None
 
-        analysis = self.analyze(history)
+        analysis = self.current_analysis()
 
         dominant = analysis["dominant_color"]
         threshold = analysis["threshold"]
 
         if self._active_color is None:
-            if dominant is None or self._stopped_at_len == len(history):
+            if dominant is None or self._stopped_at_len == self.rolls_seen:
                 return None
             self._active_color = dominant
             self._loss_streak = 0
@@ -79,6 +72,32 @@ class Strategy(StrategyBase):
 
         return {"color": self._active_color, "reason": reason}
 
+    def signal_kernel(self, colors: Any) -> vectorized.SignalArrays:
+        red = vectorized.rolling_count(colors, vectorized.RED, 20)
+        black = vectorized.rolling_count(colors, vectorized.BLACK, 20)
+        white = vectorized.rolling_count(colors, vectorized.WHITE, 20)
+        threshold = vectorized.choose(white > 0, 13, 14)
+        ready = vectorized.warmed_up(colors, 20)
+        dominant = vectorized.choose(red >= threshold, vectorized.RED, vectorized.BLACK)
+        activations = (ready & ((red >= threshold) | (black >= threshold))).nonzero()[0]
+        stops = {
+            code: (vectorized.run_lengths(colors != code) >= 3).nonzero()[0]
+            for code in (vectorized.RED, vectorized.BLACK)
+        }
+        mask = vectorized.no_signals(colors)
+        target = vectorized.filled(colors, vectorized.NO_COLOR)
+        start = vectorized.first_at_or_after(activations, 0)
+        while start is not None:
+            color = int(dominant[start])
+            stop = vectorized.first_at_or_after(stops[color], start + 3)
+            end = len(colors) if stop is None else stop
+            mask[start:end] = True
+            target[start:end] = color
+            if stop is None:
+                break
+            start = vectorized.first_at_or_after(activations, stop + 1)
+        return vectorized.SignalArrays(mask=mask, color=target)
+
     def validate(self, prediction: Dict[str, Any], result: Dict[str, Any]) -> bool:
         result_color = result.get("color")
         return prediction.get("color") == result_color
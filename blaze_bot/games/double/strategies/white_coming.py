@@ -1,40 +1,44 @@
 from __future__ import annotations
 
-from typing import Any, Dict, List, Optional
-from blaze_bot.strategies.base import StrategyBase
-from collections import Counter
+from typing import Any, Dict, Optional
+from blaze_bot.core.rolling import ColorWindow
+from blaze_bot.strategies.base import IncrementalStrategy
 
-class Strategy(StrategyBase):
+class Strategy(IncrementalStrategy):
     """Sinaliza branco quando uma cor domina 14/20 resultados recentes."""
 
     MARTINGALE = 13
     MARTINGALE_FACTOR = 1.1
 
-    def __init__(self) -> None:
+    def declare_features(self) -> Dict[str, Any]:
+        return {"window": ColorWindow(20)}
+
+    def reset_state(self) -> None:
         self._active = False
         self._losses = 0
         self._stopped_at_len: Optional[int] = None
         self._pending_stop_len = False
 
-    def analyze(self, history: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def current_analysis(self) -> Dict[str, Any]:
         if self._pending_stop_len:
-            self._stopped_at_len = len(history)
+            self._stopped_at_len = self.rolls_seen
             self._pending_stop_len = False
-        colors = [item.get("color") for item in history[-20:] if item.get("color")]
-        counts = Counter(colors)
-        dominant_count = max(counts.values()) if counts else 0
-        return {"counts": dict(counts), "dominant_count": dominant_count}
+        window = self.features["window"]
+        return {
+            "counts": window.counts(),
+            "dominant_count": window.max_count(),
+        }
 
-    def predict(self, history: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
-        if len(history) < 20:
+    def predict_next(self) -> Optional[Dict[str, Any]]:
+        if self.rolls_seen < 20:
             return None
 
-        analysis = self.analyze(history)
+        analysis = self.current_analysis()
 
         if self._active:
             return None
 
-        if analysis["dominant_count"] < 14 or self._stopped_at_len == len(history):
+        if analysis["dominant_count"] < 14 or self._stopped_at_len == self.rolls_seen:
             return None
         self._active = True
         self._losses = 0
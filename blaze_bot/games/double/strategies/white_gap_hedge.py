@@ -1,12 +1,13 @@
 from __future__ import annotations
 
-from collections import Counter
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Optional
 
-from blaze_bot.strategies.base import StrategyBase
+from blaze_bot.core import vectorized
+from blaze_bot.core.rolling import ColorWindow, WhiteGapTracker
+from blaze_bot.strategies.base import IncrementalStrategy
 
 
-class Strategy(StrategyBase):
+class Strategy(IncrementalStrategy):
     """Hedge entre cor dominante e branco após longos gaps sem branco."""
 
     MARTINGALE = 0
@@ -14,40 +15,32 @@ class Strategy(StrategyBase):
     WINDOW = 10
     DOMINANCE = 7
 
-    def _rolls_since_white(self, history: List[Dict[str, Any]]) -> int:
-        gap = 0
-        for item in reversed(history):
-            if item.get("color") == "white":
-                break
-            gap += 1
-        return gap
+    def declare_features(self) -> Dict[str, Any]:
+        return {"gap": WhiteGapTracker(), "window": ColorWindow(self.WINDOW)}
 
-    def analyze(self, history: List[Dict[str, Any]]) -> Dict[str, Any]:
-        gap = self._rolls_since_white(history)
-        recent = [
-            item.get("color")
-            for item in history[-self.WINDOW :]
-            if item.get("color") in {"red", "black"}
-        ]
-        counts = Counter(recent)
+    def current_analysis(self) -> Dict[str, Any]:
+        window = self.features["window"]
+        counts: Dict[str, int] = {}
         dominant_color = None
         dominant_count = 0
         for color in ("red", "black"):
-            count = counts.get(color, 0)
+            count = window.count(color)
+            if count:
+                counts[color] = count
             if count > dominant_count:
                 dominant_color = color
                 dominant_count = count
         return {
-            "gap": gap,
-            "counts": dict(counts),
+            "gap": self.features["gap"].gap,
+            "counts": counts,
             "dominant_color": dominant_color,
             "dominant_count": dominant_count,
         }
 
-    def predict(self, history: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
-        if len(history) < self.WINDOW:
+    def predict_next(self) -> Optional[Dict[str, Any]]:
+        if self.rolls_seen < self.WINDOW:
             return None
-        analysis = self.analyze(history)
+        analysis = self.current_analysis()
         if analysis["gap"] < self.GAP_THRESHOLD:
             return None
         dominant_color = analysis["dominant_color"]
@@ -65,6 +58,20 @@ class Strategy(StrategyBase):
             "reason": reason,
         }
 
+    def signal_kernel(self, colors: Any) -> vectorized.SignalArrays:
+        red = vectorized.rolling_count(colors, vectorized.RED, self.WINDOW)
+        black = vectorized.rolling_count(colors, vectorized.BLACK, self.WINDOW)
+        dominant_count = vectorized.maximum(red, black)
+        mask = (
+            vectorized.warmed_up(colors, self.WINDOW)
+            & (vectorized.white_gaps(colors) >= self.GAP_THRESHOLD)
+            & (dominant_count >= self.DOMINANCE)
+            & (dominant_count > 0)
+        )
+        target = vectorized.choose(black > red, vectorized.BLACK, vectorized.RED)
+        hedge = vectorized.filled(colors, vectorized.WHITE)
+        return vectorized.SignalArrays(mask=mask, color=target, hedge=hedge)
+
     def validate(self, prediction: Dict[str, Any], result: Dict[str, Any]) -> bool:
         result_color = result.get("color")
         bet_split = prediction.get("bet_split")
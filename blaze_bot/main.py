@@ -5,7 +5,8 @@ import asyncio
 import json
 import logging
 import sys
-from dataclasses import dataclass
+import time
+from dataclasses import dataclass, replace
 from datetime import datetime
 from pathlib import Path
 from typing import Any, Dict, Iterable, List
@@ -16,10 +17,22 @@ if __package__ is None or __package__ == "":
 from blaze_bot.config.settings import Settings
 from blaze_bot.core.bank import BankManager, BankSettings
 from blaze_bot.core.backtest import run_backtest
+from blaze_bot.core.checkpoint import Checkpointer
 from blaze_bot.core.engine import Engine
-from blaze_bot.games import GameConfig, available_games
+from blaze_bot.core.history import DEFAULT_RETENTION
+from blaze_bot.core.sweep import run_sweep, variants_from_spec, write_results
+from blaze_bot.core.vectorized import run_backtest_vectorized, supports_vectorized
+from blaze_bot.data.archive import RollArchive
+from blaze_bot.data.capture import ReplaySource
+from blaze_bot.data.hub import ConnectionHub
+from blaze_bot.data.merge import MergeReport, merge_recordings, write_gap_report, write_merged
+from blaze_bot.data.recorder import SessionRecorder
+from blaze_bot.data.recordings import iter_history
+from blaze_bot.data.rollfile import RollFile, convert_to_rolls, is_roll_file
+from blaze_bot.games import GameConfig, available_games, default_game_key
 from blaze_bot.games.strategies import available_strategies, build_strategy
 from blaze_bot.strategies.base import MultiStrategy
+from blaze_bot.notifications.latency import LatencyProbe
 from blaze_bot.notifications.terminal import TerminalNotifier
 from blaze_bot.notifications.telegram import TelegramNotifier
 
@@ -31,35 +44,137 @@ class GameSession:
 
 
 def load_history(path: Path) -> List[Dict[str, Any]]:
-    raw = path.read_text(encoding="utf-8").strip()
-    if not raw:
-        return []
-    if raw.startswith("["):
-        return json.loads(raw)
-    return [json.loads(line) for line in raw.splitlines() if line.strip()]
+    return list(iter_history(path))
 
 
-def build_notifiers(settings: Settings, game_label: str) -> list[Any]:
+def build_notifiers(settings: Settings, game: GameConfig) -> list[Any]:
     notifiers: list[Any] = [TerminalNotifier()]
+    if settings.latency_probe:
+        notifiers.append(LatencyProbe())
     if settings.telegram_token and settings.telegram_chat_id:
         notifiers.append(
-            TelegramNotifier(settings.telegram_token, settings.telegram_chat_id, game_label)
+            TelegramNotifier(
+                settings.telegram_token,
+                settings.telegram_chat_id,
+                game.label,
+                digest_window=settings.telegram_digest_window,
+                outbox_path=create_outbox_path(game.key) if settings.telegram_outbox else None,
+            )
         )
     return notifiers
 
 
+def close_notifiers(notifiers: Iterable[Any]) -> None:
+    for notifier in notifiers:
+        if hasattr(notifier, "metrics"):
+            logging.info("Métricas de envio (%s): %s", type(notifier).__name__, notifier.metrics())
+        if hasattr(notifier, "close"):
+            notifier.close()
+
+
 def build_arg_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(description="Blaze Double bot")
     parser.add_argument(
         "--backtest-file",
         type=Path,
-        help="Arquivo JSON/JSONL com histórico para backtest",
+        help="Arquivo JSON/JSONL (opcionalmente .gz/.xz) ou .rolls com histórico para backtest",
+    )
+    parser.add_argument(
+        "--convert-rolls",
+        type=Path,
+        help="Converte --backtest-file para o formato binário .rolls e encerra",
+    )
+    parser.add_argument(
+        "--history-limit",
+        type=int,
+        default=DEFAULT_RETENTION,
+        help="Rodadas mantidas em memória durante o backtest (0 para ilimitado)",
+    )
+    parser.add_argument(
+        "--vectorized",
+        action="store_true",
+        help="Usa os kernels NumPy das estratégias que os suportam",
+    )
+    parser.add_argument(
+        "--sweep",
+        type=Path,
+        help="Arquivo JSON com grid/random search de constantes (requer --backtest-file)",
+    )
+    parser.add_argument(
+        "--sweep-output",
+        type=Path,
+        help="CSV com o ranking do sweep (padrão: data/sweeps/)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Processos usados pelo sweep (padrão: núcleos disponíveis)",
+    )
+    parser.add_argument(
+        "--archive",
+        type=Path,
+        help="Arquivo SQLite com as rodadas gravadas (padrão: data/archive.sqlite3)",
+    )
+    parser.add_argument(
+        "--ingest",
+        type=Path,
+        nargs="+",
+        help="Importa gravações (arquivos ou diretórios) para o --archive e encerra",
+    )
+    parser.add_argument(
+        "--catalog",
+        action="store_true",
+        help="Lista as sessões do --archive com contagens e lacunas e encerra",
+    )
+    parser.add_argument(
+        "--backtest-archive",
+        action="store_true",
+        help="Backtest sobre o --archive, filtrado por --start/--end/--source",
+    )
+    parser.add_argument("--start", help="Início do intervalo (ISO, inclusivo)")
+    parser.add_argument("--end", help="Fim do intervalo (ISO, exclusivo)")
+    parser.add_argument("--source", help="Limita o backtest a uma sessão do catálogo")
+    parser.add_argument(
+        "--merge",
+        type=Path,
+        nargs="+",
+        help="Gravações (arquivos ou diretórios) unidas por timestamp, sem duplicatas, para backtest",
+    )
+    parser.add_argument(
+        "--merge-output",
+        type=Path,
+        help="Grava o resultado de --merge (JSONL, .gz/.xz ou .rolls) e as lacunas em CSV e encerra",
+    )
+    parser.add_argument(
+        "--replay-frames",
+        type=Path,
+        help="Captura de frames brutos (BLAZE_DOUBLE_CAPTURE) reproduzida pelo pipeline ao vivo",
+    )
+    parser.add_argument(
+        "--replay-speed",
+        type=float,
+        default=1.0,
+        help="Velocidade do replay (1 = ritmo original, 0 = o mais rápido possível)",
     )
     return parser
 
 
-def run_backtest_mode(strategy: Any, history: Iterable[Dict[str, Any]]) -> None:
-    results = run_backtest(strategy, history)
+def run_backtest_mode(
+    strategy: Any,
+    history: Iterable[Dict[str, Any]],
+    *,
+    history_limit: int | None = DEFAULT_RETENTION,
+    vectorized: bool = False,
+) -> None:
+    started = time.perf_counter()
+    if vectorized and supports_vectorized(strategy):
+        results = run_backtest_vectorized(strategy, history)
+    else:
+        if vectorized:
+            print("[BACKTEST] Estratégia sem kernel vetorizado (ou NumPy ausente); usando o modo padrão.")
+        results = run_backtest(strategy, history, history_limit=history_limit)
+    elapsed = time.perf_counter() - started
     print(
         "[BACKTEST] Entradas: {entries} | Wins: {wins} | Losses: {losses} | Winrate: {winrate:.2f}%".format(
             entries=_format_stat(results["entries"]),
@@ -68,6 +183,11 @@ def run_backtest_mode(strategy: Any, history: Iterable[Dict[str, Any]]) -> None:
             winrate=results["winrate"],
         )
     )
+    rolls_per_second = results["rolls"] / elapsed if elapsed > 0 else 0.0
+    print(
+        f"[BACKTEST] Rodadas: {results['rolls']} | Tempo: {elapsed:.2f}s | "
+        f"Throughput: {rolls_per_second:,.0f} rodadas/s"
+    )
     per_strategy = results.get("per_strategy", {})
     for name, stats in per_strategy.items():
         min_winrate, max_winrate = _winrate_limits_for(strategy, name)
@@ -85,30 +205,97 @@ def run_backtest_mode(strategy: Any, history: Iterable[Dict[str, Any]]) -> None:
         )
 
 
+def run_sweep_mode(
+    spec_path: Path,
+    backtest_file: Path,
+    *,
+    output: Path | None = None,
+    workers: int | None = None,
+    vectorized: bool = False,
+) -> None:
+    spec = json.loads(spec_path.read_text(encoding="utf-8"))
+    games = available_games()
+    game = games.get(spec.get("game", default_game_key()))
+    if game is None:
+        raise ValueError(f"Jogo não encontrado: {spec.get('game')}")
+    strategy_key = spec.get("strategy")
+    if not strategy_key:
+        raise ValueError("Especificação de sweep precisa de 'strategy'.")
+    variants = variants_from_spec(spec)
+    print(f"[SWEEP] {strategy_key}: {len(variants)} variantes em {backtest_file}")
+    started = time.perf_counter()
+    ranked = run_sweep(
+        game.strategy_package,
+        strategy_key,
+        variants,
+        backtest_file,
+        workers=workers,
+        vectorized=vectorized,
+        min_entries=float(spec.get("min_entries", 1)),
+    )
+    elapsed = time.perf_counter() - started
+    output = output or create_sweep_path(strategy_key)
+    write_results(output, ranked)
+    print(f"[SWEEP] Concluído em {elapsed:.2f}s. Ranking salvo em {output}")
+    for item in ranked[: int(spec.get("top", 10))]:
+        params = ", ".join(f"{name}={value}" for name, value in item["params"].items())
+        print(
+            "[SWEEP #{rank}] {params} | Entradas: {entries} | Wins: {wins} | "
+            "Losses: {losses} | Winrate: {winrate:.2f}%".format(
+                rank=item["rank"],
+                params=params,
+                entries=_format_stat(item["entries"]),
+                wins=_format_stat(item["wins"]),
+                losses=_format_stat(item["losses"]),
+                winrate=item["winrate"],
+            )
+        )
+
+
 def run_live(settings: Settings, sessions: Iterable[GameSession]) -> None:
     bank_settings = prompt_bank_settings()
+    hub = ConnectionHub()
 
     async def _run_game(session: GameSession) -> None:
-        notifiers = build_notifiers(settings, session.game.label)
+        notifiers = build_notifiers(settings, session.game)
         strategy_names = _strategy_names(session.strategy)
         bank_manager = BankManager(bank_settings, strategy_names)
         engine = Engine(
             strategy=session.strategy,
             notifiers=notifiers,
             bank_manager=bank_manager,
+            history_limit=settings.history_retention,
+        )
+        checkpointer = (
+            Checkpointer(
+                create_checkpoint_path(session.game.key),
+                every=settings.checkpoint_every,
+                max_age=settings.checkpoint_max_age,
+            )
+            if settings.checkpoint_every > 0
+            else None
         )
+        if checkpointer is not None:
+            restored = checkpointer.restore(engine)
+            if restored:
+                print(f"[CHECKPOINT] Estado retomado: {restored}")
         for notifier in notifiers:
             if hasattr(notifier, "startup"):
                 notifier.startup(strategy_names)
-        backtest_path = create_backtest_path(session.game.key)
-        print(f"[BACKTEST] Gravando resultados em {backtest_path}")
-        socket = session.game.socket_builder(settings)
-        stream = socket.listen()
-        with backtest_path.open("a", encoding="utf-8") as backtest_file:
+        recorder = create_recorder(settings, session.game.key)
+        print(f"[BACKTEST] Gravando resultados em {recorder.path}")
+        channel_key = (session.game.key, settings.websocket_url, settings.websocket_room)
+        feed = hub.subscribe(
+            channel_key,
+            lambda: session.game.socket_builder(settings),
+            maxsize=settings.websocket_queue_size,
+            overflow=settings.websocket_queue_overflow,
+        )
+        try:
             while True:
                 try:
                     result = await asyncio.wait_for(
-                        stream.__anext__(), timeout=settings.websocket_result_timeout
+                        feed.get(), timeout=settings.websocket_result_timeout
                     )
                 except asyncio.TimeoutError:
                     for notifier in notifiers:
@@ -117,21 +304,41 @@ def run_live(settings: Settings, sessions: Iterable[GameSession]) -> None:
                                 f"Nenhum novo resultado recebido após {settings.websocket_result_timeout:.0f}s."
                             )
                     continue
-                except StopAsyncIteration:
+                if result is None:
                     break
-                backtest_file.write(json.dumps(result, ensure_ascii=False) + "\n")
-                backtest_file.flush()
-                engine.process_result(result)
+                recorder.record(result)
+                await asyncio.to_thread(_process_result, engine, checkpointer, result)
+        finally:
+            hub.unsubscribe(channel_key, feed)
+            logging.info("Métricas da fila de resultados: %s", feed.snapshot())
+            close_notifiers(notifiers)
+            await asyncio.to_thread(recorder.close)
+            logging.info("Métricas do gravador: %s", recorder.snapshot())
+            if checkpointer is not None:
+                await asyncio.to_thread(checkpointer.close)
+                logging.info("Métricas do checkpoint: %s", checkpointer.snapshot())
 
     async def _run_all() -> None:
         tasks = [asyncio.create_task(_run_game(session)) for session in sessions]
         if not tasks:
             return
-        await asyncio.gather(*tasks)
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            await hub.close()
 
     asyncio.run(_run_all())
 
 
+def _process_result(
+    engine: Engine, checkpointer: Checkpointer | None, result: Dict[str, Any]
+) -> None:
+    """Roda o Engine fora do event loop e captura o snapshot entre duas rodadas."""
+    engine.process_result(result)
+    if checkpointer is not None:
+        checkpointer.maybe_save(engine)
+
+
 def prompt_games() -> List[GameConfig]:
     games = available_games()
     if not games:
@@ -268,11 +475,64 @@ def _parse_float(raw: str) -> float:
         return 1.0
 
 
-def create_backtest_path(game_key: str) -> Path:
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+def create_recorder(settings: Settings, game_key: str) -> SessionRecorder:
     directory = Path(__file__).resolve().parent / "data" / "backtests"
+    return SessionRecorder(
+        directory,
+        f"backtest_{game_key}",
+        commit_every=settings.recording_commit_every,
+        commit_interval=settings.recording_commit_interval,
+        fsync=settings.recording_fsync,
+        rotate_bytes=settings.recording_rotate_bytes,
+        rotate_seconds=settings.recording_rotate_seconds,
+        compression=settings.recording_compression,
+    )
+
+
+def create_outbox_path(game_key: str) -> Path:
+    directory = Path(__file__).resolve().parent / "data" / "outbox"
+    directory.mkdir(parents=True, exist_ok=True)
+    return directory / f"telegram_{game_key}.jsonl"
+
+
+def create_checkpoint_path(game_key: str) -> Path:
+    directory = Path(__file__).resolve().parent / "data" / "checkpoints"
+    directory.mkdir(parents=True, exist_ok=True)
+    return directory / f"engine_{game_key}.pkl"
+
+
+def create_archive_path() -> Path:
+    return Path(__file__).resolve().parent / "data" / "archive.sqlite3"
+
+
+def create_sweep_path(strategy_key: str) -> Path:
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    directory = Path(__file__).resolve().parent / "data" / "sweeps"
     directory.mkdir(parents=True, exist_ok=True)
-    return directory / f"backtest_{game_key}_{timestamp}.jsonl"
+    return directory / f"sweep_{strategy_key}_{timestamp}.csv"
+
+
+def print_catalog(archive: RollArchive) -> None:
+    sessions = archive.sessions()
+    for info in sessions:
+        print(
+            f"[CATÁLOGO] {info.source} | {info.first_timestamp or '-'} → {info.last_timestamp or '-'} | "
+            f"rodadas: {info.rolls} | novas: {info.inserted} | duplicadas: {info.duplicates} | "
+            f"lacunas: {info.gaps} ({info.missing} rodadas)"
+        )
+    print(f"[CATÁLOGO] {len(sessions)} sessões, {archive.count()} rodadas únicas em {archive.path}")
+
+
+def print_merge_report(report: MergeReport) -> None:
+    print(
+        f"[MERGE] Arquivos: {report.files} | Lidas: {report.read} | Únicas: {report.written} | "
+        f"Duplicadas: {report.duplicates} | Sem timestamp: {report.skipped} | "
+        f"Fora de ordem: {report.out_of_order}"
+    )
+    print(f"[MERGE] Lacunas: {len(report.gaps)} ({report.missing} rodadas faltando)")
+    for gap in sorted(report.gaps, key=lambda item: item.missing, reverse=True)[:10]:
+        row = gap.to_row()
+        print(f"[MERGE]   {row['start']} → {row['end']}: {row['missing']} rodadas")
 
 
 def _winrate_limits_for(strategy: Any, strategy_name: str) -> tuple[float, float]:
@@ -314,19 +574,130 @@ def main() -> None:
         format="%(asctime)s [%(levelname)s] %(message)s",
     )
 
+    if args.sweep:
+        if not args.backtest_file:
+            parser.error("--sweep requer --backtest-file")
+        run_sweep_mode(
+            args.sweep,
+            args.backtest_file,
+            output=args.sweep_output,
+            workers=args.workers,
+            vectorized=args.vectorized,
+        )
+        return
+
+    if args.convert_rolls:
+        if not args.backtest_file:
+            parser.error("--convert-rolls requer --backtest-file")
+        started = time.perf_counter()
+        rolls = convert_to_rolls(iter_history(args.backtest_file), args.convert_rolls)
+        print(
+            f"[CONVERSÃO] {rolls} rodadas gravadas em {args.convert_rolls} "
+            f"({time.perf_counter() - started:.2f}s)"
+        )
+        return
+
+    if args.ingest or args.catalog:
+        with RollArchive(args.archive or create_archive_path()) as archive:
+            if args.ingest:
+                for info in archive.ingest_many(args.ingest):
+                    print(
+                        f"[ARQUIVO] {info.source}: {info.rolls} rodadas | novas: {info.inserted} | "
+                        f"duplicadas: {info.duplicates} | lacunas: {info.gaps} ({info.missing} rodadas)"
+                    )
+            if args.catalog:
+                print_catalog(archive)
+        return
+
+    if args.merge_output:
+        if not args.merge:
+            parser.error("--merge-output requer --merge")
+        report = write_merged(args.merge, args.merge_output)
+        gaps_path = args.merge_output.with_name(f"{args.merge_output.name}.gaps.csv")
+        write_gap_report(report, gaps_path)
+        print_merge_report(report)
+        print(f"[MERGE] Linha do tempo em {args.merge_output} | lacunas em {gaps_path}")
+        return
+
+    if args.merge:
+        report = MergeReport()
+        selected_games = prompt_games()
+        sessions = [GameSession(game=game, strategy=prompt_strategies(game)) for game in selected_games]
+        if len(sessions) > 1:
+            raise ValueError("Backtest suporta apenas um jogo por vez.")
+        run_backtest_mode(
+            sessions[0].strategy,
+            merge_recordings(args.merge, report),
+            history_limit=args.history_limit if args.history_limit > 0 else None,
+            vectorized=args.vectorized,
+        )
+        print_merge_report(report)
+        return
+
+    if args.backtest_archive:
+        archive = RollArchive(args.archive or create_archive_path())
+        selected_games = prompt_games()
+        sessions = [GameSession(game=game, strategy=prompt_strategies(game)) for game in selected_games]
+        if len(sessions) > 1:
+            raise ValueError("Backtest suporta apenas um jogo por vez.")
+        try:
+            run_backtest_mode(
+                sessions[0].strategy,
+                archive.iter_range(args.start, args.end, source=args.source),
+                history_limit=args.history_limit if args.history_limit > 0 else None,
+                vectorized=args.vectorized,
+            )
+        finally:
+            archive.close()
+        return
+
     if args.backtest_file:
-        history = load_history(args.backtest_file)
+        history: Iterable[Dict[str, Any]] = (
+            RollFile(args.backtest_file)
+            if is_roll_file(args.backtest_file)
+            else iter_history(args.backtest_file)
+        )
         selected_games = prompt_games()
         sessions = [GameSession(game=game, strategy=prompt_strategies(game)) for game in selected_games]
         if len(sessions) > 1:
             raise ValueError("Backtest suporta apenas um jogo por vez.")
-        run_backtest_mode(sessions[0].strategy, history)
+        run_backtest_mode(
+            sessions[0].strategy,
+            history,
+            history_limit=args.history_limit if args.history_limit > 0 else None,
+            vectorized=args.vectorized,
+        )
         return
 
     selected_games = prompt_games()
     sessions = [GameSession(game=game, strategy=prompt_strategies(game)) for game in selected_games]
+    if args.replay_frames:
+        settings, sessions = replay_sessions(
+            settings, sessions, args.replay_frames, speed=args.replay_speed
+        )
     run_live(settings, sessions)
 
 
+def replay_sessions(
+    settings: Settings,
+    sessions: List[GameSession],
+    frames_path: Path,
+    *,
+    speed: float,
+) -> tuple[Settings, List[GameSession]]:
+    """Troca o socket de cada sessão pelo replay da captura, sem Telegram nem checkpoint."""
+    replayed = [
+        GameSession(
+            game=replace(
+                session.game,
+                socket_builder=lambda _settings: ReplaySource(frames_path, speed=speed),
+            ),
+            strategy=session.strategy,
+        )
+        for session in sessions
+    ]
+    return replace(settings, telegram_token=None, checkpoint_every=0), replayed
+
+
 if __name__ == "__main__":
     main()
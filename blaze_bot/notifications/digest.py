@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import time
+from typing import Dict, List
+
+TELEGRAM_MESSAGE_LIMIT = 4096
+
+
+class MessageDigest:
+    """Acumula mensagens e as entrega juntas, por rodada ou por janela de tempo.
+
+    Com ``window`` <= 0 o digest fica pronto a cada rodada; com ``window`` > 0
+    só fica pronto depois que a mensagem mais antiga esperou ``window``
+    segundos. ``flush`` devolve blocos que respeitam ``limit`` caracteres.
+    """
+
+    def __init__(
+        self,
+        window: float = 0.0,
+        *,
+        limit: int = TELEGRAM_MESSAGE_LIMIT,
+        separator: str = "\n\n",
+    ) -> None:
+        self.window = window
+        self.limit = limit
+        self.separator = separator
+        self.messages_in = 0
+        self.messages_out = 0
+        self._parts: List[str] = []
+        self._started_at: float | None = None
+
+    def add(self, text: str) -> None:
+        if not self._parts:
+            self._started_at = time.monotonic()
+        self._parts.append(text)
+        self.messages_in += 1
+
+    def due(self) -> bool:
+        if not self._parts:
+            return False
+        if self.window <= 0 or self._started_at is None:
+            return True
+        return time.monotonic() - self._started_at >= self.window
+
+    def flush(self) -> List[str]:
+        chunks = split_message(self._parts, self.limit, self.separator)
+        self._parts = []
+        self._started_at = None
+        self.messages_out += len(chunks)
+        return chunks
+
+    def snapshot(self) -> Dict[str, int]:
+        return {
+            "pending": len(self._parts),
+            "messages_in": self.messages_in,
+            "messages_out": self.messages_out,
+        }
+
+    def __len__(self) -> int:
+        return len(self._parts)
+
+
+def split_message(
+    parts: List[str], limit: int = TELEGRAM_MESSAGE_LIMIT, separator: str = "\n\n"
+) -> List[str]:
+    """Junta ``parts`` em blocos de até ``limit`` caracteres.
+
+    As mensagens só são quebradas no meio quando sozinhas excedem o limite;
+    nesse caso o corte acontece em fim de linha sempre que possível.
+    """
+    chunks: List[str] = []
+    current = ""
+    for part in parts:
+        for piece in _fit(part, limit):
+            candidate = f"{current}{separator}{piece}" if current else piece
+            if len(candidate) <= limit:
+                current = candidate
+                continue
+            chunks.append(current)
+            current = piece
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def _fit(text: str, limit: int) -> List[str]:
+    pieces: List[str] = []
+    while len(text) > limit:
+        cut = text.rfind("\n", 0, limit + 1)
+        if cut <= 0:
+            cut = limit
+        pieces.append(text[:cut])
+        text = text[cut:].lstrip("\n")
+    if text:
+        pieces.append(text)
+    return pieces
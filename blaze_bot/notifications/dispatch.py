@@ -0,0 +1,297 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, Hashable
+
+from blaze_bot.notifications.outbox import CircuitBreaker, Outbox
+
+logger = logging.getLogger(__name__)
+
+PRIORITY_PREDICTION = 0
+PRIORITY_EVALUATION = 1
+PRIORITY_STATS = 2
+
+PRIORITY_NAMES = {
+    PRIORITY_PREDICTION: "prediction",
+    PRIORITY_EVALUATION: "evaluation",
+    PRIORITY_STATS: "stats",
+}
+
+
+class PermanentDeliveryError(RuntimeError):
+    """Falha que não adianta repetir (ex.: mensagem rejeitada pela API)."""
+
+
+@dataclass
+class OutboundMessage:
+    text: str
+    priority: int = PRIORITY_STATS
+    coalesce_key: Hashable | None = None
+    message_id: str | None = None
+    enqueued_at: float = field(default_factory=time.monotonic)
+
+
+@dataclass
+class LatencyTracker:
+    count: int = 0
+    last: float | None = None
+    avg: float | None = None
+    max: float = 0.0
+
+    def register(self, latency: float) -> None:
+        self.count += 1
+        self.last = latency
+        self.max = max(self.max, latency)
+        if self.avg is None:
+            self.avg = latency
+        else:
+            self.avg = (self.avg * 0.9) + (latency * 0.1)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {"count": self.count, "last": self.last, "avg": self.avg, "max": self.max}
+
+
+@dataclass
+class DispatchMetrics:
+    sent: int = 0
+    failed: int = 0
+    dropped: int = 0
+    coalesced: int = 0
+    retried: int = 0
+    replayed: int = 0
+    send_latency: LatencyTracker = field(default_factory=LatencyTracker)
+    delivery_latency: Dict[int, LatencyTracker] = field(
+        default_factory=lambda: {priority: LatencyTracker() for priority in PRIORITY_NAMES}
+    )
+
+
+class BackgroundDispatcher:
+    """Fila de saída limitada e priorizada, consumida por uma thread dedicada.
+
+    Sinais (prediction) saem antes de avaliações, que saem antes de stats e
+    mensagens informativas. Mensagens com a mesma ``coalesce_key`` ainda na
+    fila são substituídas pela mais recente. Com a fila cheia, a mensagem mais
+    antiga de menor prioridade é descartada para abrir espaço; se a nova for a
+    de menor prioridade, ela própria é descartada. ``submit`` nunca bloqueia e
+    falhas de envio são registradas no log sem chegar a quem chamou.
+
+    Falhas transitórias recolocam a mensagem no início da fila e alimentam o
+    ``CircuitBreaker``, que pausa os envios enquanto estiver aberto. Com um
+    ``Outbox``, cada mensagem é gravada em disco antes de entrar na fila e só
+    é confirmada depois de entregue ou descartada; as pendentes de uma
+    execução anterior são reenfileiradas na inicialização (entrega
+    at-least-once).
+    """
+
+    def __init__(
+        self,
+        send: Callable[[str], None],
+        *,
+        maxsize: int = 100,
+        name: str = "notifier",
+        outbox: Outbox | None = None,
+        breaker: CircuitBreaker | None = None,
+    ) -> None:
+        self._send = send
+        self._name = name
+        self.maxsize = max(1, maxsize)
+        self._pending: Dict[int, Deque[OutboundMessage]] = {
+            priority: deque() for priority in sorted(PRIORITY_NAMES)
+        }
+        self._by_key: Dict[Hashable, OutboundMessage] = {}
+        self._size = 0
+        self._closing = False
+        self._condition = threading.Condition()
+        self.metrics = DispatchMetrics()
+        self._outbox = outbox
+        self._breaker = breaker or CircuitBreaker()
+        if outbox is not None:
+            self._replay(outbox)
+        self._worker = threading.Thread(target=self._run, name=name, daemon=True)
+        self._worker.start()
+
+    def submit(
+        self,
+        text: str,
+        *,
+        priority: int = PRIORITY_STATS,
+        coalesce_key: Hashable | None = None,
+    ) -> bool:
+        with self._condition:
+            if coalesce_key is not None:
+                queued = self._by_key.get(coalesce_key)
+                if queued is not None:
+                    queued.text = text
+                    if self._outbox is not None and queued.message_id is not None:
+                        self._outbox.put(text, priority, message_id=queued.message_id)
+                    self.metrics.coalesced += 1
+                    return True
+            if self._size >= self.maxsize and not self._evict_below(priority):
+                self.metrics.dropped += 1
+                logger.warning(
+                    "Fila de %s cheia (%d); mensagem %s descartada.",
+                    self._name,
+                    self.maxsize,
+                    PRIORITY_NAMES.get(priority, priority),
+                )
+                return False
+            message = OutboundMessage(text, priority=priority, coalesce_key=coalesce_key)
+            if self._outbox is not None:
+                message.message_id = self._outbox.put(text, priority)
+            self._pending.setdefault(priority, deque()).append(message)
+            if coalesce_key is not None:
+                self._by_key[coalesce_key] = message
+            self._size += 1
+            self._condition.notify()
+        return True
+
+    def queue_depth(self) -> int:
+        return self._size
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._condition:
+            depth_by_priority = {
+                PRIORITY_NAMES.get(priority, str(priority)): len(items)
+                for priority, items in self._pending.items()
+            }
+        return {
+            "queue_depth": self._size,
+            "queue_depth_by_priority": depth_by_priority,
+            "sent": self.metrics.sent,
+            "failed": self.metrics.failed,
+            "dropped": self.metrics.dropped,
+            "coalesced": self.metrics.coalesced,
+            "retried": self.metrics.retried,
+            "replayed": self.metrics.replayed,
+            "circuit": self._breaker.state,
+            "outbox_pending": len(self._outbox) if self._outbox is not None else None,
+            "send_latency": self.metrics.send_latency.snapshot(),
+            "delivery_latency": {
+                PRIORITY_NAMES.get(priority, str(priority)): tracker.snapshot()
+                for priority, tracker in self.metrics.delivery_latency.items()
+            },
+        }
+
+    def close(self, timeout: float | None = 5.0) -> None:
+        """Envia o que estiver na fila e encerra a thread.
+
+        Com o circuito aberto a thread encerra sem esperar; o que sobrar fica
+        no outbox (quando configurado) para a próxima execução.
+        """
+        with self._condition:
+            self._closing = True
+            self._condition.notify()
+        self._worker.join(timeout)
+
+    def _evict_below(self, priority: int) -> bool:
+        for queued_priority in sorted(self._pending, reverse=True):
+            if queued_priority <= priority:
+                return False
+            items = self._pending[queued_priority]
+            if items:
+                evicted = items.popleft()
+                self._forget(evicted)
+                self._size -= 1
+                self._confirm(evicted)
+                self.metrics.dropped += 1
+                return True
+        return False
+
+    def _replay(self, outbox: Outbox) -> None:
+        for entry in outbox.pending():
+            message = OutboundMessage(
+                entry.text, priority=entry.priority, message_id=entry.message_id
+            )
+            self._pending.setdefault(entry.priority, deque()).append(message)
+            self._size += 1
+            self.metrics.replayed += 1
+        if self.metrics.replayed:
+            logger.info(
+                "%d mensagem(ns) pendente(s) recuperada(s) do outbox de %s.",
+                self.metrics.replayed,
+                self._name,
+            )
+
+    def _confirm(self, message: OutboundMessage) -> None:
+        if self._outbox is not None and message.message_id is not None:
+            self._outbox.ack(message.message_id)
+
+    def _requeue(self, message: OutboundMessage) -> None:
+        with self._condition:
+            if message.coalesce_key is not None:
+                if message.coalesce_key in self._by_key:
+                    # Já existe uma versão mais nova na fila.
+                    self._confirm(message)
+                    return
+                self._by_key[message.coalesce_key] = message
+            self._pending.setdefault(message.priority, deque()).appendleft(message)
+            self._size += 1
+            self.metrics.retried += 1
+
+    def _forget(self, message: OutboundMessage) -> None:
+        if message.coalesce_key is not None and self._by_key.get(message.coalesce_key) is message:
+            del self._by_key[message.coalesce_key]
+
+    def _next_message(self) -> OutboundMessage | None:
+        with self._condition:
+            while True:
+                delay = self._breaker.wait_time()
+                if self._closing and (not self._size or delay > 0):
+                    return None
+                if not self._size:
+                    self._condition.wait()
+                    continue
+                if delay > 0:
+                    self._condition.wait(delay)
+                    continue
+                for priority in sorted(self._pending):
+                    items = self._pending[priority]
+                    if items:
+                        message = items.popleft()
+                        self._forget(message)
+                        self._size -= 1
+                        return message
+
+    def _run(self) -> None:
+        while True:
+            message = self._next_message()
+            if message is None:
+                if self._size:
+                    logger.warning(
+                        "%d mensagem(ns) de %s não enviada(s) ao encerrar.", self._size, self._name
+                    )
+                return
+            started = time.monotonic()
+            try:
+                self._send(message.text)
+            except PermanentDeliveryError as exc:
+                self.metrics.failed += 1
+                self._confirm(message)
+                logger.warning("Mensagem descartada por %s: %s", self._name, exc)
+                continue
+            except Exception as exc:  # noqa: BLE001 - a thread não pode morrer
+                self.metrics.failed += 1
+                self._breaker.record_failure()
+                self._requeue(message)
+                logger.warning("Falha ao enviar mensagem via %s: %s", self._name, exc)
+                continue
+            finished = time.monotonic()
+            self._breaker.record_success()
+            self._confirm(message)
+            self.metrics.sent += 1
+            self.metrics.send_latency.register(finished - started)
+            self.metrics.delivery_latency.setdefault(
+                message.priority, LatencyTracker()
+            ).register(finished - message.enqueued_at)
+            logger.debug(
+                "Mensagem %s enviada via %s em %.0fms (%.0fms desde o enfileiramento, fila=%d).",
+                PRIORITY_NAMES.get(message.priority, message.priority),
+                self._name,
+                (finished - started) * 1000,
+                (finished - message.enqueued_at) * 1000,
+                self._size,
+            )
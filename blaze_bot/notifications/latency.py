@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import time
+from typing import Any, Dict, List
+
+from blaze_bot.core.history import UNKNOWN_TIMESTAMP, to_epoch_ms
+
+
+class LatencyProbe:
+    """Mede o atraso entre o timestamp da rodada e o fim do processamento.
+
+    Pensado para testes de carga contra o servidor local
+    (``benchmarks/replay_server.py``), que marca cada rodada com o horário de
+    envio: a latência cobre socket, parser, fila e Engine. Contra a Blaze o
+    timestamp é o ``created_at`` da rodada, então o valor inclui o atraso do
+    servidor.
+    """
+
+    def __init__(self) -> None:
+        self.rolls = 0
+        self.latencies_ms: List[float] = []
+        self._pending_ms: int | None = None
+        self._started_at: float | None = None
+        self._finished_at: float | None = None
+
+    def result(self, result: Dict[str, Any]) -> None:
+        if self._started_at is None:
+            self._started_at = time.monotonic()
+        timestamp = to_epoch_ms(result.get("timestamp"))
+        self._pending_ms = None if timestamp == UNKNOWN_TIMESTAMP else timestamp
+
+    def roll_complete(self) -> None:
+        self.rolls += 1
+        self._finished_at = time.monotonic()
+        if self._pending_ms is not None:
+            self.latencies_ms.append(time.time() * 1000 - self._pending_ms)
+            self._pending_ms = None
+
+    def metrics(self) -> Dict[str, Any]:
+        elapsed = (
+            self._finished_at - self._started_at
+            if self._started_at is not None and self._finished_at is not None
+            else 0.0
+        )
+        ordered = sorted(self.latencies_ms)
+        return {
+            "rolls": self.rolls,
+            "rolls_per_second": self.rolls / elapsed if elapsed > 0 else None,
+            "latency_ms_p50": _percentile(ordered, 0.50),
+            "latency_ms_p95": _percentile(ordered, 0.95),
+            "latency_ms_p99": _percentile(ordered, 0.99),
+            "latency_ms_max": ordered[-1] if ordered else None,
+        }
+
+    def close(self) -> None:
+        report = self.metrics()
+        if not report["rolls"]:
+            return
+        print(
+            "[LATÊNCIA] Rodadas: {rolls} | Throughput: {rate:.1f} rodadas/s | "
+            "p50: {p50} | p95: {p95} | p99: {p99} | máx: {max}".format(
+                rolls=report["rolls"],
+                rate=report["rolls_per_second"] or 0.0,
+                p50=_format_ms(report["latency_ms_p50"]),
+                p95=_format_ms(report["latency_ms_p95"]),
+                p99=_format_ms(report["latency_ms_p99"]),
+                max=_format_ms(report["latency_ms_max"]),
+            )
+        )
+
+
+def _format_ms(value: float | None) -> str:
+    return "-" if value is None else f"{value:.1f}ms"
+
+
+def _percentile(ordered: List[float], fraction: float) -> float | None:
+    if not ordered:
+        return None
+    index = min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))
+    return ordered[index]
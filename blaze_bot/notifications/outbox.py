@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+from typing import IO, Dict, List
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class OutboxEntry:
+    message_id: str
+    text: str
+    priority: int
+    created_at: float
+
+
+class Outbox:
+    """Registro append-only (JSONL) das mensagens ainda não entregues.
+
+    Cada mensagem gera um registro ``put`` e, depois de entregue (ou
+    descartada), um ``ack`` com o mesmo id. Ao abrir o arquivo, os ``put``
+    sem ``ack`` são as mensagens pendentes da execução anterior; um ``put``
+    repetido com o mesmo id substitui o texto (mensagem coalescida). A escrita
+    só faz ``flush``: um crash do processo não perde nada, uma queda de
+    energia pode perder as últimas linhas.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        *,
+        max_age: float | None = 900.0,
+        compact_every: int = 1000,
+    ) -> None:
+        self.path = path
+        self.max_age = max_age
+        self.compact_every = compact_every
+        self._lock = threading.Lock()
+        self._pending: Dict[str, OutboxEntry] = {}
+        self._acked_since_compact = 0
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._load()
+        self._handle = self._rewrite()
+
+    def put(self, text: str, priority: int, *, message_id: str | None = None) -> str:
+        message_id = message_id or uuid.uuid4().hex
+        with self._lock:
+            entry = self._pending.get(message_id)
+            created_at = entry.created_at if entry is not None else time.time()
+            self._pending[message_id] = OutboxEntry(message_id, text, priority, created_at)
+            self._append(
+                {
+                    "op": "put",
+                    "id": message_id,
+                    "text": text,
+                    "priority": priority,
+                    "created_at": created_at,
+                }
+            )
+        return message_id
+
+    def ack(self, message_id: str) -> None:
+        with self._lock:
+            if self._pending.pop(message_id, None) is None:
+                return
+            self._append({"op": "ack", "id": message_id})
+            self._acked_since_compact += 1
+            if self._acked_since_compact >= self.compact_every:
+                self._handle.close()
+                self._handle = self._rewrite()
+
+    def pending(self) -> List[OutboxEntry]:
+        """Mensagens não confirmadas, na ordem em que foram criadas."""
+        with self._lock:
+            return sorted(self._pending.values(), key=lambda entry: entry.created_at)
+
+    def close(self) -> None:
+        with self._lock:
+            self._handle.close()
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def _append(self, record: Dict[str, object]) -> None:
+        self._handle.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._handle.flush()
+
+    def _load(self) -> None:
+        if not self.path.exists():
+            return
+        with self.path.open("r", encoding="utf-8") as handle:
+            for line in handle:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # Última linha truncada por um crash no meio da escrita.
+                    continue
+                if record.get("op") == "ack":
+                    self._pending.pop(record["id"], None)
+                elif record.get("op") == "put":
+                    self._pending[record["id"]] = OutboxEntry(
+                        record["id"],
+                        record["text"],
+                        int(record.get("priority", 0)),
+                        float(record.get("created_at", 0.0)),
+                    )
+        if self.max_age is not None:
+            cutoff = time.time() - self.max_age
+            expired = [key for key, entry in self._pending.items() if entry.created_at < cutoff]
+            for key in expired:
+                del self._pending[key]
+            if expired:
+                logger.warning(
+                    "%d mensagem(ns) pendente(s) em %s expiraram e não serão reenviadas.",
+                    len(expired),
+                    self.path,
+                )
+
+    def _rewrite(self) -> IO[str]:
+        """Compacta o arquivo mantendo só os pendentes e o reabre para append."""
+        temporary = self.path.with_suffix(self.path.suffix + ".tmp")
+        with temporary.open("w", encoding="utf-8") as handle:
+            for entry in sorted(self._pending.values(), key=lambda item: item.created_at):
+                handle.write(
+                    json.dumps(
+                        {
+                            "op": "put",
+                            "id": entry.message_id,
+                            "text": entry.text,
+                            "priority": entry.priority,
+                            "created_at": entry.created_at,
+                        },
+                        ensure_ascii=False,
+                    )
+                    + "\n"
+                )
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(temporary, self.path)
+        self._acked_since_compact = 0
+        return self.path.open("a", encoding="utf-8")
+
+
+class CircuitBreaker:
+    """Abre após ``failure_threshold`` falhas seguidas e testa de novo após ``reset_timeout``."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened = 0
+        self._opened_at: float | None = None
+
+    @property
+    def state(self) -> str:
+        if self._opened_at is None:
+            return self.CLOSED
+        if time.monotonic() - self._opened_at >= self.reset_timeout:
+            return self.HALF_OPEN
+        return self.OPEN
+
+    def wait_time(self) -> float:
+        """Segundos até uma nova tentativa ser permitida (0 quando já pode tentar)."""
+        if self._opened_at is None:
+            return 0.0
+        return max(0.0, self.reset_timeout - (time.monotonic() - self._opened_at))
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self._opened_at = None
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self._opened_at is not None or self.failures >= self.failure_threshold:
+            if self._opened_at is None:
+                self.opened += 1
+                logger.warning(
+                    "Circuito aberto após %d falhas seguidas; nova tentativa em %.0fs.",
+                    self.failures,
+                    self.reset_timeout,
+                )
+            self._opened_at = time.monotonic()
@@ -1,23 +1,93 @@
 from __future__ import annotations
 
-from typing import Any, Dict
+import logging
+import time
+from pathlib import Path
+from typing import Any, Dict, Hashable
 import requests
 
+from blaze_bot.notifications.dispatch import (
+    PRIORITY_EVALUATION,
+    PRIORITY_PREDICTION,
+    PRIORITY_STATS,
+    BackgroundDispatcher,
+    PermanentDeliveryError,
+)
+from blaze_bot.notifications.digest import MessageDigest
+from blaze_bot.notifications.outbox import Outbox
+
+logger = logging.getLogger(__name__)
+
 class TelegramNotifier:
-    def __init__(self, token: str, chat_id: str, game_label: str) -> None:
+    MAX_RATE_LIMIT_RETRIES = 3
+
+    def __init__(
+        self,
+        token: str,
+        chat_id: str,
+        game_label: str,
+        *,
+        queue_size: int = 100,
+        timeout: float = 10.0,
+        digest_window: float | None = None,
+        outbox_path: Path | None = None,
+    ) -> None:
         self.token = token
         self.chat_id = chat_id
         self.game_label = game_label
+        self.timeout = timeout
+        self._session = requests.Session()
+        self._outbox = Outbox(outbox_path) if outbox_path is not None else None
+        self._dispatcher = BackgroundDispatcher(
+            self.deliver, maxsize=queue_size, name="telegram", outbox=self._outbox
+        )
+        self._digest = MessageDigest(digest_window) if digest_window is not None else None
+
+    def send_message(
+        self,
+        text: str,
+        *,
+        priority: int = PRIORITY_STATS,
+        coalesce_key: Hashable | None = None,
+    ) -> None:
+        """Enfileira a mensagem; o envio acontece na thread do dispatcher."""
+        self._dispatcher.submit(text, priority=priority, coalesce_key=coalesce_key)
+
+    def metrics(self) -> Dict[str, Any]:
+        snapshot = self._dispatcher.snapshot()
+        if self._digest is not None:
+            snapshot["digest"] = self._digest.snapshot()
+        return snapshot
 
-    def send_message(self, text: str) -> None:
+    def roll_complete(self) -> None:
+        """Chamado pelo Engine ao fim de cada rodada para enviar o digest pendente."""
+        if self._digest is not None and self._digest.due():
+            self._flush_digest()
+
+    def close(self, timeout: float | None = 5.0) -> None:
+        if self._digest is not None:
+            self._flush_digest()
+        self._dispatcher.close(timeout)
+        self._session.close()
+        if self._outbox is not None:
+            self._outbox.close()
+
+    def deliver(self, text: str) -> None:
+        """Envia a mensagem de forma síncrona, respeitando retry_after (HTTP 429)."""
         url = f"https://api.telegram.org/bot{self.token}/sendMessage"
-        response = requests.post(
-            url,
-            json={"chat_id": self.chat_id, "text": text, "parse_mode": "HTML"},
-            timeout=10,
-        )
-        if response.ok:
-            return
+        for _ in range(self.MAX_RATE_LIMIT_RETRIES + 1):
+            response = self._session.post(
+                url,
+                json={"chat_id": self.chat_id, "text": text, "parse_mode": "HTML"},
+                timeout=self.timeout,
+            )
+            if response.ok:
+                return
+            retry_after = _retry_after(response)
+            if retry_after is None:
+                break
+            logger.warning("Telegram limitou o envio; aguardando %ss.", retry_after)
+            time.sleep(retry_after)
 
         details = ""
         try:
@@ -30,10 +100,10 @@ class TelegramNotifier:
             if response.text:
                 details = f" (response={response.text})"
 
-        raise requests.HTTPError(
-            f"Telegram API request failed with status {response.status_code}{details}",
-            response=response,
-        )
+        message = f"Telegram API request failed with status {response.status_code}{details}"
+        if 400 <= response.status_code < 500 and response.status_code != 429:
+            raise PermanentDeliveryError(message)
+        raise requests.HTTPError(message, response=response)
 
     def prediction(self, prediction: Dict[str, Any]) -> None:
         strategy = prediction.get("strategy") or "-"
@@ -47,7 +117,7 @@ class TelegramNotifier:
         ]
         if reason:
             lines.append(f"<b>✳️ Motivo:</b> {reason}")
-        self.send_message("\n".join(lines))
+        self.send_message("\n".join(lines), priority=PRIORITY_PREDICTION)
 
     def startup(self, strategies: list[str]) -> None:
         strategies_display = ", ".join(strategies) if strategies else "-"
@@ -58,7 +128,7 @@ class TelegramNotifier:
                 f"<b>🧠 Estratégias ativas:</b> {strategies_display}",
             ]
         )
-        self.send_message(message)
+        self.send_message(message, priority=PRIORITY_STATS)
 
     def evaluation(
         self,
@@ -102,7 +172,24 @@ class TelegramNotifier:
         ]
         if bank_snapshot:
             message_lines.extend(_format_bank_lines(bank_snapshot))
-        self.send_message("\n".join(message_lines))
+        if self._digest is not None:
+            self._digest.add("\n".join(message_lines))
+            return
+        self.send_message("\n".join(message_lines), priority=PRIORITY_EVALUATION)
+
+    def _flush_digest(self) -> None:
+        for chunk in self._digest.flush():
+            self.send_message(chunk, priority=PRIORITY_EVALUATION)
+
+
+def _retry_after(response: requests.Response) -> float | None:
+    if response.status_code != 429:
+        return None
+    try:
+        parameters = response.json().get("parameters") or {}
+        return float(parameters.get("retry_after", 1))
+    except (ValueError, AttributeError, TypeError):
+        return 1.0
 
 
 def _format_color(color: Any) -> tuple[str, str]:
@@ -4,6 +4,8 @@ from abc import ABC, abstractmethod
 import sys
 from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
 
+from blaze_bot.core.features import FeatureStore
+
 
 class StrategyBase(ABC):
     MIN_WINRATE = 0.0
@@ -30,6 +32,30 @@ class StrategyBase(ABC):
             factor = 1.0
         return max(1.0, factor)
 
+    def lanes(self) -> List["StrategyBase"]:
+        """Estratégias com predições pendentes independentes."""
+        return [self]
+
+    def is_incremental(self) -> bool:
+        return False
+
+    def on_result(self, result: Dict[str, Any]) -> None:
+        """Recebe cada novo resultado (usado por estratégias incrementais)."""
+
+    def predict_next(
+        self,
+    ) -> Optional[Union[Dict[str, Any], Sequence[Dict[str, Any]]]]:
+        """Retorna predição a partir do estado incremental."""
+        return None
+
+    def next_prediction(
+        self, history: Sequence[Dict[str, Any]]
+    ) -> Optional[Union[Dict[str, Any], Sequence[Dict[str, Any]]]]:
+        if self.is_incremental():
+            return self.predict_next()
+        self.analyze(history)
+        return self.predict(history)
+
     @abstractmethod
     def analyze(self, history: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Recebe histórico e retorna decisão."""
@@ -45,23 +71,125 @@ class StrategyBase(ABC):
         """Retorna True (win) ou False (loss)."""
 
 
+class IncrementalStrategy(StrategyBase):
+    """Estratégia que mantém estado O(1) por resultado via on_result().
+
+    Features rolantes (janelas de cores, sequência, gap do branco) são
+    declaradas em declare_features() e lidas em ``self.features``; quando a
+    estratégia roda dentro de um MultiStrategy, o FeatureStore é compartilhado
+    e cada feature é atualizada uma única vez por rodada.
+    """
+
+    def __init__(self) -> None:
+        self.rolls_seen = 0
+        self.bind_features(FeatureStore(), shared=False)
+
+    def is_incremental(self) -> bool:
+        return True
+
+    def declare_features(self) -> Dict[str, Any]:
+        """Retorna as features rolantes usadas pela estratégia."""
+        return {}
+
+    def bind_features(self, store: FeatureStore, *, shared: bool = True) -> None:
+        self._feature_store = store
+        self._owns_features = not shared
+        self.features = store.register_all(self.declare_features())
+        self.reset()
+
+    def reset(self) -> None:
+        self.rolls_seen = 0
+        if self._owns_features:
+            self._feature_store.reset()
+        self.reset_state()
+
+    def on_result(self, result: Dict[str, Any]) -> None:
+        if self._owns_features:
+            self._feature_store.push(result)
+        self.rolls_seen += 1
+        self.update(result)
+
+    def reset_state(self) -> None:
+        """Reinicia o estado incremental próprio da estratégia."""
+
+    def update(self, result: Dict[str, Any]) -> None:
+        """Atualiza o estado próprio com um novo resultado."""
+
+    @abstractmethod
+    def current_analysis(self) -> Dict[str, Any]:
+        """Retorna a análise do estado atual."""
+
+    @abstractmethod
+    def predict_next(
+        self,
+    ) -> Optional[Union[Dict[str, Any], Sequence[Dict[str, Any]]]]:
+        """Retorna predição a partir do estado incremental."""
+
+    def analyze(self, history: List[Dict[str, Any]]) -> Dict[str, Any]:
+        self._sync(history)
+        return self.current_analysis()
+
+    def predict(
+        self, history: List[Dict[str, Any]]
+    ) -> Optional[Union[Dict[str, Any], Sequence[Dict[str, Any]]]]:
+        self._sync(history)
+        return self.predict_next()
+
+    def _sync(self, history: Sequence[Dict[str, Any]]) -> None:
+        total = _history_total(history)
+        if total < self.rolls_seen:
+            self.reset()
+        for result in _unseen_results(history, total - self.rolls_seen):
+            self.on_result(result)
+        self.rolls_seen = total
+
+
 class MultiStrategy(StrategyBase):
     def __init__(self, strategies: List[StrategyBase]) -> None:
         if not strategies:
             raise ValueError("Nenhuma estratégia informada.")
         self._strategies = strategies
         self._last_strategy: Optional[StrategyBase] = None
+        self._rolls_seen = 0
+        self.feature_store = FeatureStore()
+        for strategy in strategies:
+            if isinstance(strategy, IncrementalStrategy):
+                strategy.bind_features(self.feature_store)
 
     @property
     def strategies(self) -> List[StrategyBase]:
         return list(self._strategies)
 
+    def lanes(self) -> List[StrategyBase]:
+        return list(self._strategies)
+
+    def is_incremental(self) -> bool:
+        return all(strategy.is_incremental() for strategy in self._strategies)
+
+    def on_result(self, result: Dict[str, Any]) -> None:
+        self._rolls_seen += 1
+        self.feature_store.push(result)
+        for strategy in self._strategies:
+            strategy.on_result(result)
+
     def analyze(self, history: List[Dict[str, Any]]) -> Dict[str, Any]:
+        self._sync(history)
         analysis: Dict[str, Any] = {}
         for strategy in self._strategies:
             analysis.update(strategy.analyze(history))
         return analysis
 
+    def predict_next(
+        self,
+    ) -> Optional[Union[Dict[str, Any], Sequence[Dict[str, Any]]]]:
+        predictions: List[Dict[str, Any]] = []
+        for strategy in self._strategies:
+            self._last_strategy = strategy
+            predictions.extend(
+                item for _, item in _with_strategy(strategy, strategy.predict_next())
+            )
+        return predictions or None
+
     def predict(
         self, history: List[Dict[str, Any]]
     ) -> Optional[Union[Dict[str, Any], Sequence[Dict[str, Any]]]]:
@@ -79,21 +207,50 @@ class MultiStrategy(StrategyBase):
     def _predictions_with_strategies(
         self, history: List[Dict[str, Any]]
     ) -> List[Tuple[StrategyBase, Dict[str, Any]]]:
+        self._sync(history)
         predictions: List[Tuple[StrategyBase, Dict[str, Any]]] = []
         for strategy in self._strategies:
             self._last_strategy = strategy
-            prediction = strategy.predict(history)
-            if prediction is None:
-                continue
-            if isinstance(prediction, dict):
-                predictions.append((strategy, prediction))
-            else:
-                predictions.extend(
-                    [(strategy, item) for item in prediction if isinstance(item, dict)]
-                )
+            predictions.extend(_with_strategy(strategy, strategy.predict(history)))
         return predictions
 
+    def _sync(self, history: Sequence[Dict[str, Any]]) -> None:
+        total = _history_total(history)
+        if total < self._rolls_seen:
+            self._rolls_seen = 0
+            self.feature_store.reset()
+            for strategy in self._strategies:
+                if isinstance(strategy, IncrementalStrategy):
+                    strategy.reset()
+        for result in _unseen_results(history, total - self._rolls_seen):
+            self.on_result(result)
+        self._rolls_seen = total
+
     def validate(self, prediction: Dict[str, Any], result: Dict[str, Any]) -> bool:
         if self._last_strategy is None:
             return False
         return self._last_strategy.validate(prediction, result)
+
+
+def _history_total(history: Sequence[Dict[str, Any]]) -> int:
+    """Total de rodadas já vistas (RollHistory com retenção guarda só as últimas)."""
+    return getattr(history, "total", len(history))
+
+
+def _unseen_results(
+    history: Sequence[Dict[str, Any]], missing: int
+) -> Sequence[Dict[str, Any]]:
+    if missing <= 0:
+        return []
+    return history[max(0, len(history) - missing) :]
+
+
+def _with_strategy(
+    strategy: StrategyBase,
+    prediction: Optional[Union[Dict[str, Any], Sequence[Dict[str, Any]]]],
+) -> List[Tuple[StrategyBase, Dict[str, Any]]]:
+    if prediction is None:
+        return []
+    if isinstance(prediction, dict):
+        return [(strategy, prediction)]
+    return [(strategy, item) for item in prediction if isinstance(item, dict)]